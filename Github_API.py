@@ -1,62 +1,578 @@
+import argparse
+import json
+import os
 import requests
 import pandas as pd
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from requests.adapters import HTTPAdapter
+from urllib.parse import parse_qs, urlencode, urlparse
+
+class ResponseCache:
+    """On-disk cache of GitHub responses replayed through conditional requests."""
+
+    def __init__(self, path="github_cache.db", max_bytes=50 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0  # 304s answered from cache (do not count against the rate limit)
+        self.misses = 0  # full 200 responses downloaded and stored for revalidation
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS responses (
+                                key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,
+                                link TEXT, body BLOB, size INTEGER, last_used REAL)""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses (last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(url, params=None):
+        return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    def lookup(self, key):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, link, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return {'etag': row[0], 'last_modified': row[1], 'link': row[2], 'body': row[3]}
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_hit(self):
+        with self.lock:
+            self.hits += 1
+
+    def store(self, key, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return  # nothing to revalidate against
+        body = response.content
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              (key, etag, last_modified, response.headers.get('Link'),
+                               body, len(body), time.time()))
+            self.misses += 1
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        # Drop least recently used entries until the cache fits in max_bytes
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self):
+        with self.lock:
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'bytes': size}
+
+class RateLimiter:
+    """
+    Token bucket paced by GitHub's X-RateLimit-* and Retry-After headers; share one across GitHubAPI instances.
+    Requests run unpaced while more than `reserve` (a fraction of the hourly limit) is left, so a run that
+    needs far less than the budget is never slowed; below that, the rest is spread over the window.
+    """
+
+    def __init__(self, burst=10, reserve=0.1):
+        self.burst = burst
+        self.reserve = reserve
+        self.tokens = float(burst)
+        self.rate = None  # tokens per second; None while unpaced (or before the first response)
+        self.remaining = None
+        self.limit = None
+        self.reset_at = None
+        self.paused_until = 0.0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.updated = time.time()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _wait_time(self, now):
+        wait = max(0.0, self.paused_until - now)
+        if self.rate is not None and self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def acquire(self):
+        # Reserve a token under the lock, then sleep outside it so other threads queue behind us
+        with self.lock:
+            now = time.time()
+            self._refill(now)
+            wait = self._wait_time(now)
+            if self.rate is not None:
+                self.tokens -= 1
+            if wait > 0:
+                self.waits += 1
+                self.total_wait += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, response):
+        headers = response.headers
+        with self.lock:
+            now = time.time()
+            self._refill(now)
+            if response.status_code == 304 and self.rate is not None:
+                # Conditional requests answered 304 are not counted against the limit: refund the token
+                self.tokens = min(self.burst, self.tokens + 1)
+            if 'X-RateLimit-Remaining' in headers and 'X-RateLimit-Reset' in headers:
+                self.remaining = int(headers['X-RateLimit-Remaining'])
+                self.reset_at = float(headers['X-RateLimit-Reset'])
+                # Without X-RateLimit-Limit, the largest remaining count seen stands in for the limit
+                self.limit = int(headers.get('X-RateLimit-Limit', max(self.limit or 0, self.remaining)))
+                if self.remaining > self.limit * self.reserve:
+                    self.rate = None
+                    self.tokens = float(self.burst)
+                else:
+                    # Into the reserve: spread what is left of the budget evenly over the rest of the window
+                    window = max(self.reset_at - now, 1.0)
+                    self.rate = max(self.remaining, 1) / window
+                if self.remaining == 0:
+                    self.paused_until = max(self.paused_until, self.reset_at)
+            if 'Retry-After' in headers:
+                self.paused_until = max(self.paused_until, now + float(headers['Retry-After']))
+
+    @staticmethod
+    def is_throttled(response):
+        if response.status_code not in (403, 429):
+            return False
+        return response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers
+
+    def metrics(self):
+        with self.lock:
+            now = time.time()
+            self._refill(now)
+            return {
+                'remaining': self.remaining,
+                'limit': self.limit,
+                'reset_at': self.reset_at,
+                'rate_per_sec': self.rate,
+                'tokens': self.tokens,
+                'current_wait': self._wait_time(now),
+                'waits': self.waits,
+                'total_wait': self.total_wait
+            }
 
 class GitHubAPI:
-    def __init__(self, username, token=None):
+    def __init__(self, username, token=None, pool_size=10, cache=None, rate_limiter=None, max_retries=5,
+                 session=None):
         self.username = username
         self.base_url = "https://api.github.com"
         self.headers = {'Authorization': f'token {token}'} if token else {}
+        # One pooled session shared by every call, including concurrent ones
+        self.session = session or self.create_session(pool_size)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries  # retries after a rate-limit pause before giving up
 
-    def get_repositories(self):
-        url = f"{self.base_url}/users/{self.username}/repos"
-        response = requests.get(url, headers=self.headers)
+    @staticmethod
+    def create_session(pool_size=10):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _send(self, method, url, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = self.session.request(method, url, **kwargs)
+            if self.rate_limiter is None:
+                break
+            self.rate_limiter.update(response)
+            if not self.rate_limiter.is_throttled(response):
+                break
+            # update() recorded the pause, so the next acquire() sleeps until the reset
+        return response
+
+    def _get(self, url, params=None):
+        if self.cache is None:
+            response = self._send('GET', url, headers=self.headers, params=params)
+        else:
+            response = self._get_cached(url, params)
         if response.status_code != 200:
-            raise Exception(f"Failed to fetch repos: {response.status_code}")
-        return response.json()
+            raise Exception(f"Failed to fetch {url}: {response.status_code}")
+        return response
+
+    def _get_cached(self, url, params):
+        key = self.cache.make_key(url, params)
+        entry = self.cache.lookup(key)
+        headers = {**self.headers, **self.cache.conditional_headers(entry)}
+        response = self._send('GET', url, headers=headers, params=params)
+        if response.status_code == 304 and entry is not None:
+            # Replay the stored body and pagination links as a regular 200 response
+            response.status_code = 200
+            response._content = entry['body']
+            if entry['link']:
+                response.headers['Link'] = entry['link']
+            self.cache.record_hit()
+        elif response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+    def iter_repositories(self, per_page=100):
+        # Follow Link: rel="next" so callers can start on page 1 before the rest arrives
+        url = f"{self.base_url}/users/{self.username}/repos"
+        params = {'per_page': per_page}
+        while url:
+            response = self._get(url, params=params)
+            yield from response.json()
+            url = response.links.get('next', {}).get('url')
+            params = None  # the next URL already carries the query string
+
+    def get_repositories(self):
+        return list(self.iter_repositories())
 
     def get_commit_count(self, repo_name):
         url = f"{self.base_url}/repos/{self.username}/{repo_name}/commits"
-        response = requests.get(url, headers=self.headers, params={'per_page': 1})
-        if 'Link' in response.headers:
-            # Extract the last page number from the Link header
-            link = response.headers['Link']
-            if 'rel="last"' in link:
-                last_page = int(link.split('page=')[-1].split('>')[0])
-                return last_page
+        response = self._get(url, params={'per_page': 1})
+        if 'last' in response.links:
+            # With per_page=1 the last page number is the commit count
+            query = parse_qs(urlparse(response.links['last']['url']).query)
+            return int(query['page'][0])
         return len(response.json())  # fallback if pagination is not available
 
+class GitHubGraphQLAPI(GitHubAPI):
+    """Fetches repo stats and commit totals in batches of up to 100 repos per GraphQL query."""
+
+    REPO_STATS_QUERY = """
+    query($login: String!, $first: Int!, $after: String) {
+      repositoryOwner(login: $login) {
+        repositories(first: $first, after: $after, ownerAffiliations: OWNER, privacy: PUBLIC) {
+          pageInfo { hasNextPage endCursor }
+          nodes {
+            name
+            stargazerCount
+            forkCount
+            pushedAt
+            defaultBranchRef { target { ... on Commit { history { totalCount } } } }
+          }
+        }
+      }
+    }
+    """
+
+    def __init__(self, username, token=None, pool_size=10, cache=None, rate_limiter=None,
+                 max_retries=5, session=None, graphql_url=None):
+        super().__init__(username, token, pool_size=pool_size, cache=cache,
+                         rate_limiter=rate_limiter, max_retries=max_retries, session=session)
+        self.graphql_url = graphql_url  # defaults to {base_url}/graphql; point at a local server for testing
+
+    def _query(self, query, variables):
+        url = self.graphql_url or f"{self.base_url}/graphql"
+        response = self._send('POST', url, headers=self.headers, json={'query': query, 'variables': variables})
+        if response.status_code != 200:
+            raise Exception(f"GraphQL request failed: {response.status_code}")
+        payload = response.json()
+        if payload.get('errors'):
+            raise Exception(f"GraphQL query failed: {payload['errors'][0].get('message')}")
+        return payload['data']
+
+    def iter_repository_stats(self, per_page=100):
+        # Rows match GitHubRepoAnalyzer's REST output, so the DataFrame schema is identical
+        after = None
+        while True:
+            data = self._query(self.REPO_STATS_QUERY,
+                               {'login': self.username, 'first': per_page, 'after': after})
+            if data['repositoryOwner'] is None:
+                raise Exception(f"Failed to fetch repos: unknown owner {self.username}")
+            repositories = data['repositoryOwner']['repositories']
+            for node in repositories['nodes']:
+                branch = node['defaultBranchRef']  # None for empty repositories
+                yield {
+                    'name': node['name'],
+                    'stars': node['stargazerCount'],
+                    'forks': node['forkCount'],
+                    'commits': branch['target']['history']['totalCount'] if branch else None,
+                    'pushed_at': node['pushedAt']
+                }
+            if not repositories['pageInfo']['hasNextPage']:
+                break
+            after = repositories['pageInfo']['endCursor']
+
 class GitHubRepoAnalyzer:
-    def __init__(self, api: GitHubAPI):
+    def __init__(self, api: GitHubAPI, max_workers=1):
         self.api = api
+        self.max_workers = max_workers
+        self.previous = {}  # name -> row from the last run, used by incremental mode
+        self.stats = {'fetched': 0, 'reused': 0}
+        self.stats_lock = threading.Lock()
 
-    def analyze_repositories(self):
-        repos = self.api.get_repositories()
-        data = []
-        for repo in repos:
-            name = repo['name']
-            stars = repo['stargazers_count']
-            forks = repo['forks_count']
+    @staticmethod
+    def load_snapshot(path):
+        """Read a previous github_repo.csv so it can be passed as `previous`."""
+        if not os.path.exists(path):
+            return None
+        return pd.read_csv(path, index_col=0)
+
+    def _count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def _analyze_repo(self, repo):
+        prev = self.previous.get(repo['name'])
+        if prev is not None and prev.get('pushed_at') == repo.get('pushed_at') \
+                and not pd.isna(prev.get('commits')):
+            # Nothing was pushed since the last run, so the commit count cannot have changed
+            commits = int(prev['commits'])
+            self._count('reused')
+        else:
             try:
-                commits = self.api.get_commit_count(name)
+                commits = self.api.get_commit_count(repo['name'])
             except Exception as e:
                 commits = None
-            data.append({
-                'name': name,
-                'stars': stars,
-                'forks': forks,
-                'commits': commits
-            })
+            self._count('fetched')
+        return {
+            'name': repo['name'],
+            'stars': repo['stargazers_count'],
+            'forks': repo['forks_count'],
+            'commits': commits,
+            'pushed_at': repo.get('pushed_at')
+        }
+
+    def _map_concurrent(self, repos):
+        # Keep at most 2 * max_workers lookups queued and yield results in input order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for repo in repos:
+                pending.append(executor.submit(self._analyze_repo, repo))
+                if len(pending) >= self.max_workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def analyze_repositories(self, previous=None):
+        """
+        Build the name/stars/forks/commits/pushed_at table. `previous` (a DataFrame or list of row
+        dicts from an earlier run) turns on incremental mode: repos whose pushed_at is unchanged
+        reuse their stored commit count instead of calling get_commit_count.
+        """
+        if isinstance(previous, pd.DataFrame):
+            previous = previous.to_dict('records')
+        self.previous = {row['name']: row for row in previous or []}
+        self.stats = {'fetched': 0, 'reused': 0}
+        if isinstance(self.api, GitHubGraphQLAPI):
+            # Commit totals arrive with the listing, so there is nothing to fan out
+            return pd.DataFrame(list(self.api.iter_repository_stats()))
+        repos = self.api.iter_repositories()
+        if self.max_workers > 1:
+            data = list(self._map_concurrent(repos))
+        else:
+            data = [self._analyze_repo(repo) for repo in repos]
         df = pd.DataFrame(data)
         return df
 
+class GitHubBatchAnalyzer:
+    """Analyzes many users or orgs concurrently, checkpointing each finished one to an append-only NDJSON file."""
+
+    def __init__(self, token=None, checkpoint_path="github_batch.ndjson", max_users=4, max_workers=1,
+                 cache=None, rate_limiter=None, use_graphql=False, previous_checkpoint=None):
+        self.token = token
+        self.checkpoint_path = checkpoint_path
+        # Rows from an earlier run's checkpoint, used to skip commit lookups for unchanged repos
+        self.previous = self.read_checkpoint(previous_checkpoint) if previous_checkpoint else {}
+        self.max_users = max_users  # users analyzed at the same time
+        self.max_workers = max_workers  # commit lookups in flight per user
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.use_graphql = use_graphql
+        self.session = GitHubAPI.create_session(max_users * max_workers)
+
+    @staticmethod
+    def read_usernames(path):
+        with open(path, encoding="utf-8") as f:
+            lines = (line.strip() for line in f)
+            return [line for line in lines if line and not line.startswith('#')]
+
+    @staticmethod
+    def read_checkpoint(path):
+        done = {}
+        if not os.path.exists(path):
+            return done
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by an interrupted run; that user is fetched again
+                done[record['username']] = record['repos']
+        return done
+
+    def load_checkpoint(self):
+        return self.read_checkpoint(self.checkpoint_path)
+
+    def _analyze_user(self, username):
+        api_class = GitHubGraphQLAPI if self.use_graphql else GitHubAPI
+        api = api_class(username, self.token, cache=self.cache, rate_limiter=self.rate_limiter,
+                        session=self.session)
+        analyzer = GitHubRepoAnalyzer(api, max_workers=self.max_workers)
+        return analyzer.analyze_repositories(previous=self.previous.get(username))
+
+    def run(self, usernames):
+        usernames = list(dict.fromkeys(usernames))
+        done = self.load_checkpoint()
+        todo = [username for username in usernames if username not in done]
+        print(f"{len(done)} user(s) restored from {self.checkpoint_path}, {len(todo)} to fetch")
+
+        with ThreadPoolExecutor(max_workers=self.max_users) as executor, \
+                open(self.checkpoint_path, "a", encoding="utf-8") as checkpoint:
+            futures = {executor.submit(self._analyze_user, username): username for username in todo}
+            for future in as_completed(futures):
+                username = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    print(f"Failed to analyze {username}: {e}")
+                    continue  # not checkpointed, so the next run retries it
+                repos = json.loads(df.to_json(orient='records'))
+                checkpoint.write(json.dumps({'username': username, 'repos': repos}) + "\n")
+                checkpoint.flush()
+                done[username] = repos
+
+        frames = []
+        for username in usernames:
+            if username not in done:
+                continue
+            if not done[username]:
+                # An empty frame would upcast every other user's int columns to float in concat
+                print(f"{username} has no repositories")
+                continue
+            frames.append(pd.DataFrame(done[username]).assign(username=username))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+class CsvSink:
+    """Writes results to a single CSV file, as the script always has."""
+
+    def __init__(self, path="github_repo.csv"):
+        self.path = path
+
+    def write(self, df, username=None, snapshot_date=None):
+        df.to_csv(self.path)
+
+class ParquetSink:
+    """
+    Writes typed, compressed Parquet partitioned as
+    root/username=<user>/snapshot_date=<YYYY-MM-DD>/part-0.parquet.
+    """
+
+    def __init__(self, root="github_repo_parquet", compression="zstd"):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.root = root
+        self.compression = compression
+        self.schema = pyarrow.schema([
+            ('name', pyarrow.string()),
+            ('stars', pyarrow.int64()),
+            ('forks', pyarrow.int64()),
+            ('commits', pyarrow.int64()),  # nullable: failed or empty repos
+            ('pushed_at', pyarrow.timestamp('s', tz='UTC')),
+        ])
+
+    def _to_table(self, df):
+        columns = {
+            'name': df['name'].astype(str),
+            'stars': df['stars'].astype('int64'),
+            'forks': df['forks'].astype('int64'),
+            'commits': df['commits'].astype('Int64'),
+            'pushed_at': pd.to_datetime(df['pushed_at'], utc=True),
+        }
+        arrays = [self.pa.array(columns[field.name], type=field.type, from_pandas=True) for field in self.schema]
+        return self.pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def write(self, df, username=None, snapshot_date=None):
+        if df.empty:
+            return
+        # Batch results carry a username column; single-user results pass username explicitly
+        snapshot_date = (snapshot_date or date.today()).isoformat()
+        groups = df.groupby('username') if username is None else [(username, df)]
+        for user, user_df in groups:
+            directory = os.path.join(self.root, f"username={user}", f"snapshot_date={snapshot_date}")
+            os.makedirs(directory, exist_ok=True)
+            self.pq.write_table(self._to_table(user_df), os.path.join(directory, "part-0.parquet"),
+                                compression=self.compression)
+
+    def read(self, columns=None, filters=None):
+        """Load snapshots with column pruning and partition/row filters, e.g. [('username', '=', 'octocat')]."""
+        table = self.pq.read_table(self.root, columns=columns, filters=filters)
+        # Keep int64 columns as nullable Int64 so missing commit counts do not turn them into floats
+        return table.to_pandas(types_mapper={self.pa.int64(): pd.Int64Dtype()}.get)
+
 # --- Usage ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze GitHub repositories for one or many users")
+    parser.add_argument("--users-file", help="file with one username or org per line for a batch run")
+    parser.add_argument("--checkpoint", default="github_batch.ndjson", help="append-only batch checkpoint")
+    parser.add_argument("--users-in-flight", type=int, default=4, help="users analyzed concurrently")
+    parser.add_argument("--previous", help="earlier output (github_repo.csv, or a batch checkpoint) to refresh "
+                                           "incrementally; only repos with a new pushed_at are recounted")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="output sink")
+    args = parser.parse_args()
+
     username = "octocat"  # change this to your username or any public one
     token = None  # optional: generate a GitHub personal access token to avoid rate limits
+    max_workers = 8  # concurrent commit-count lookups; 1 keeps the sequential behaviour
+
+    cache = ResponseCache("github_cache.db")
+    rate_limiter = RateLimiter()
 
-    github_api = GitHubAPI(username, token)
-    analyzer = GitHubRepoAnalyzer(github_api)
+    if args.users_file:
+        batch = GitHubBatchAnalyzer(token, checkpoint_path=args.checkpoint, max_users=args.users_in_flight,
+                                    max_workers=max_workers, cache=cache, rate_limiter=rate_limiter,
+                                    use_graphql=bool(token), previous_checkpoint=args.previous)
+        df = batch.run(batch.read_usernames(args.users_file))
+        username = None  # taken from the username column
+        output_file = "github_batch.csv"
+    else:
+        if token:
+            # GraphQL needs a token but costs ~1 request per 100 repos instead of 1 + N
+            github_api = GitHubGraphQLAPI(username, token, pool_size=max_workers, cache=cache,
+                                          rate_limiter=rate_limiter)
+        else:
+            github_api = GitHubAPI(username, token, pool_size=max_workers, cache=cache,
+                                   rate_limiter=rate_limiter)
+        analyzer = GitHubRepoAnalyzer(github_api, max_workers=max_workers)
+        previous = analyzer.load_snapshot(args.previous) if args.previous else None
+        df = analyzer.analyze_repositories(previous=previous)
+        output_file = "github_repo.csv"
+        print(f"Commit counts fetched: {analyzer.stats['fetched']}, reused: {analyzer.stats['reused']}")
 
-    df = analyzer.analyze_repositories()
-    print(df.sort_values(by='stars', ascending=False))
-    df.to_csv("github_repo.csv")
+    if df.empty:
+        print("No repositories to report; nothing written.")
+    else:
+        print(df.sort_values(by='stars', ascending=False))
+        sink = ParquetSink() if args.format == "parquet" else CsvSink(output_file)
+        sink.write(df, username=username)
+    print(f"Cache: {cache.stats()}")
+    print(f"Rate limit: {rate_limiter.metrics()}")
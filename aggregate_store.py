@@ -0,0 +1,203 @@
+import math
+from collections import Counter
+
+import pandas as pd
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch (DDSketch-style): every quantile of positive values is
+    returned within `relative_accuracy` of the true value, using one counter per occupied
+    bucket no matter how many values were added. Zero and negative values share one bucket.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.count = 0
+
+    def add(self, value, count=1):
+        index = math.ceil(math.log(value) / self.log_gamma) if value > 0 else None
+        self.buckets[index] += count
+        self.count += count
+
+    def remove(self, value, count=1):
+        index = math.ceil(math.log(value) / self.log_gamma) if value > 0 else None
+        self.buckets[index] -= count
+        if self.buckets[index] <= 0:
+            del self.buckets[index]
+        self.count -= count
+
+    def merge(self, other):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+
+    def _value(self, index):
+        return 0.0 if index is None else 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q):
+        if not self.count:
+            return float("nan")
+        rank = q * (self.count - 1)
+        seen = self.buckets.get(None, 0)
+        if rank < seen:
+            return 0.0
+        for index in sorted(key for key in self.buckets if key is not None):
+            seen += self.buckets[index]
+            if rank < seen:
+                return self._value(index)
+        return self._value(max(key for key in self.buckets if key is not None))
+
+
+class RunningStats:
+    """
+    count / sum / sum of squares / min / max plus a quantile sketch, updated one value at a time.
+    Values can also be removed; min and max stay exact unless the removed value was the current
+    extreme, in which case the new extreme is taken from the sketch (within its accuracy) and
+    `exact_extremes` turns False.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.exact_extremes = True
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.total_squares += value * value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sketch.add(value)
+
+    def remove(self, value):
+        self.count -= 1
+        self.total -= value
+        self.total_squares -= value * value
+        self.sketch.remove(value)
+        if not self.count:
+            self.min, self.max = math.inf, -math.inf
+            return
+        # The remaining extreme lies within the removed one, so clamp the sketch estimate to it
+        if value <= self.min:
+            self.min = max(self.sketch.quantile(0), value)
+            self.exact_extremes = False
+        if value >= self.max:
+            self.max = min(self.sketch.quantile(1), value)
+            self.exact_extremes = False
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.exact_extremes = self.exact_extremes and other.exact_extremes
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else float("nan")
+
+    @property
+    def std(self):
+        # Sample standard deviation, as pandas' describe() reports
+        if self.count < 2:
+            return float("nan")
+        variance = (self.total_squares - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def describe(self):
+        return {
+            "count": float(self.count), "mean": self.mean, "std": self.std, "min": self.min,
+            "25%": self.sketch.quantile(0.25), "50%": self.sketch.quantile(0.5),
+            "75%": self.sketch.quantile(0.75), "max": self.max,
+        }
+
+
+class AggregateStore:
+    """
+    Running aggregates of record streams: RunningStats of `value` per group of each dimension,
+    and value counts of each `counted` column. Records are folded in as they arrive, so reports
+    cost O(groups) however many records have been seen.
+    """
+
+    def __init__(self, value, dimensions, counted=(), relative_accuracy=0.01):
+        self.value = value
+        self.relative_accuracy = relative_accuracy
+        self.groups = {dimension: {} for dimension in dimensions}
+        self.counts = {column: Counter() for column in counted}
+        self.records = 0
+
+    def add(self, record):
+        value = record[self.value]
+        for dimension, groups in self.groups.items():
+            key = record[dimension]
+            if key not in groups:
+                groups[key] = RunningStats(self.relative_accuracy)
+            groups[key].add(value)
+        for column, counter in self.counts.items():
+            counter[record[column]] += 1
+        self.records += 1
+
+    def add_many(self, records):
+        for record in records:
+            self.add(record)
+
+    def remove(self, record):
+        """Take a previously added record back out (its groups and counts are decremented)."""
+        value = record[self.value]
+        for dimension, groups in self.groups.items():
+            key = record[dimension]
+            groups[key].remove(value)
+            if not groups[key].count:
+                del groups[key]
+        for column, counter in self.counts.items():
+            counter[record[column]] -= 1
+            if not counter[record[column]]:
+                del counter[record[column]]
+        self.records -= 1
+
+    def replace(self, old, new):
+        """Swap a record for its updated copy, e.g. a re-scraped listing with a new price."""
+        self.remove(old)
+        self.add(new)
+
+    def merge(self, other):
+        """Fold in another store's aggregates (e.g. one built by a worker process)."""
+        for dimension, groups in other.groups.items():
+            for key, stats in groups.items():
+                if key not in self.groups[dimension]:
+                    self.groups[dimension][key] = RunningStats(self.relative_accuracy)
+                self.groups[dimension][key].merge(stats)
+        for column, counter in other.counts.items():
+            self.counts[column].update(counter)
+        self.records += other.records
+
+    def describe(self, dimension):
+        """Same layout as df.groupby(dimension)[value].describe(); quantiles come from the sketches."""
+        groups = self.groups[dimension]
+        frame = pd.DataFrame.from_dict({key: groups[key].describe() for key in sorted(groups)}, orient="index")
+        frame.index.name = dimension
+        return frame
+
+    def exact_extremes(self, dimension):
+        """False once any group's min or max had to be re-estimated after a remove()."""
+        return all(stats.exact_extremes for stats in self.groups[dimension].values())
+
+    def group_sizes(self, dimension, n=None):
+        """Records per group, largest first (like value_counts().head(n))."""
+        sizes = pd.Series({key: stats.count for key, stats in self.groups[dimension].items()}, name="count")
+        return sizes.sort_values(ascending=False, kind="stable").head(n) if n else sizes
+
+    def group_means(self, dimension):
+        return pd.Series({key: stats.mean for key, stats in self.groups[dimension].items()}, name=self.value)
+
+    def value_counts(self, column):
+        counts = pd.Series(self.counts[column], name="count", dtype="int64")
+        return counts.sort_index()
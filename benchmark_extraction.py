@@ -0,0 +1,75 @@
+"""
+Benchmark product-card extraction: the old per-field select_one path against the compiled
+ExtractionSpec used by IndonesianEcommerceScraper.parse_products.
+
+Pages are synthetic product listings (see benchmark_parsers.product_page); --bad-every N breaks
+every Nth card's price and drops its rating, to exercise the per-field error counters.
+
+    python benchmark_extraction.py --cards 10000 --repeat 3
+"""
+import argparse
+
+from benchmark_parsers import best_time, product_page
+from html_backends import BACKENDS, parse_document
+from task5_ecommerce_scraping import IndonesianEcommerceScraper
+
+
+def broken_product_page(cards, bad_every):
+    html = product_page(cards)
+    if not bad_every:
+        return html
+    parts = html.split('<div class="product-card">')
+    for i in range(1, len(parts), bad_every):
+        parts[i] = (parts[i].replace('<span class="product-price">Rp', '<span class="product-price">Hubungi penjual', 1)
+                            .replace('class="product-rating"', 'class="rating-hidden"', 1))
+    return '<div class="product-card">'.join(parts)
+
+
+def extract_select_one(root):
+    """The pre-spec parse_products loop: five select_one queries and a broad except per card."""
+    products = []
+    for card in root.select(".product-card"):
+        try:
+            products.append({
+                "name": card.select_one(".product-title").text.strip(),
+                "price": int(card.select_one(".product-price").text.replace("Rp", "").replace(".", "").strip()),
+                "rating": float(card.select_one(".product-rating").text.strip()),
+                "reviews_count": int(card.select_one(".product-reviews").text.strip().split()[0]),
+                "seller_location": card.select_one(".product-seller-location").text.strip(),
+            })
+        except Exception:
+            pass
+    return products
+
+
+def extract_spec(root):
+    spec = IndonesianEcommerceScraper().product_spec
+    return list(spec.extract_all(root)), spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10000, help="product cards on the synthetic page")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per method; the best is reported")
+    parser.add_argument("--bad-every", type=int, default=0, help="break every Nth card (0 = none)")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args()
+
+    html = broken_product_page(args.cards, args.bad_every)
+    print("Extraction only (document already parsed), then parse + extraction:")
+    print(f"{'backend':<14}{'select_one':>12}{'spec':>10}{'speedup':>10}{'end-to-end':>12}")
+    for backend in args.backends:
+        root = parse_document(html, backend)
+        products, spec = extract_spec(root)
+        if products != extract_select_one(root):
+            raise SystemExit(f"spec output differs from the select_one path on {backend}")
+        legacy = best_time(lambda: extract_select_one(root), args.repeat)
+        compiled = best_time(lambda: extract_spec(root), args.repeat)
+        parse = best_time(lambda: parse_document(html, backend), args.repeat)
+        print(f"{backend:<14}{legacy:>12.3f}{compiled:>10.3f}{legacy / compiled:>9.1f}x"
+              f"{(parse + legacy) / (parse + compiled):>11.1f}x")
+    print(f"\n{spec.extracted} products extracted, {spec.skipped} skipped; errors: {spec.error_report()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark the HTML parser backends used by the weather, e-commerce and news scrapers.
+
+Builds pages from the repo's sample markup scaled up to many rows/cards, checks every backend
+produces identical records (the first card of each page carries inline <script>/<style>), then
+reports the best-of-N parse time per backend.
+
+    python benchmark_parsers.py --rows 5000 --repeat 3
+"""
+import argparse
+import time
+
+from html_backends import BACKENDS
+from task3_scraping_basics import WeatherScraper
+from task5_ecommerce_scraping import IndonesianEcommerceScraper
+from task6_news_scraping import IndonesianNewsScraper
+
+WEATHER_ROWS = [
+    ("Jakarta", "31°C", "Sunny", "70%"),
+    ("Surabaya", "34°C", "Cloudy", "65%"),
+    ("Bandung", "27°C", "Rainy", "85%"),
+    ("Medan", "33°C", "Sunny", "68%"),
+    ("Yogyakarta", "29°C", "Thunderstorm", "75%"),
+]
+
+
+def weather_page(rows):
+    body = "".join(
+        f"<tr><td>{city}</td><td>{temp}</td><td>{condition}</td><td>{humidity}</td></tr>\n"
+        for city, temp, condition, humidity in (WEATHER_ROWS[i % len(WEATHER_ROWS)] for i in range(rows))
+    )
+    return ('<html><body><table class="weather-table">\n'
+            "<tr><th>City</th><th>Temp</th><th>Condition</th><th>Humidity</th></tr>\n"
+            f"{body}</table></body></html>")
+
+
+# Inline script/style inside a card: BeautifulSoup's get_text skips their contents, and the lxml
+# backend must do the same for the parity check to pass.
+INLINE_CODE = '<script>window.track = {"x": 1};</script><style>.promo { color: red; }</style>'
+
+
+def product_page(cards):
+    body = "".join(
+        f"""<div class="product-card">
+              <h3 class="product-title">Smartphone {INLINE_CODE if i == 0 else ""}Nusantara {i}</h3>
+              <span class="product-price">Rp {1000 + i:,}.000</span>
+              <span class="product-rating">{3 + (i % 20) / 10:.1f}</span>
+              <span class="product-reviews">{i % 500} ulasan</span>
+              <span class="product-seller-location">{WEATHER_ROWS[i % 5][0]}</span>
+            </div>\n""".replace(",", ".")
+        for i in range(cards)
+    )
+    return f"<html><body>{body}</body></html>"
+
+
+def news_page(cards):
+    body = "".join(
+        f"""<article class="news-card">
+              <h2 class="title">Ekonomi Indonesia {INLINE_CODE if i == 0 else ""}tumbuh {i}</h2>
+              <p class="summary">Pertumbuhan ekonomi positif dan stabil, ekspor turun {i}%.</p>
+              <span class="date">2024-01-{i % 28 + 1:02d}</span>
+            </article>\n"""
+        for i in range(cards)
+    )
+    return f"<html><body>{body}</body></html>"
+
+
+def parse_weather(html, parser):
+    scraper = WeatherScraper(html, parser=parser)
+    scraper.parse_html()
+    return [entry.to_list() for entry in scraper.weather_data]
+
+
+def parse_products(html, parser):
+    scraper = IndonesianEcommerceScraper(parser=parser)
+    scraper.parse_products(html, "elektronik")
+    return scraper.products
+
+
+def parse_news(html, parser):
+    scraper = IndonesianNewsScraper(parser=parser)
+    scraper.parse_articles(html, "ekonomi")
+    return scraper.news_data
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000, help="rows/cards per synthetic page")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per backend; the best is reported")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args()
+
+    cases = [
+        ("weather", weather_page(args.rows), parse_weather),
+        ("products", product_page(args.rows), parse_products),
+        ("news", news_page(args.rows), parse_news),
+    ]
+    print(f"{'page':<10}{'backend':<14}{'seconds':>10}{'speedup':>10}")
+    for name, html, parse in cases:
+        reference = parse(html, args.backends[0])
+        baseline = None
+        for backend in args.backends:
+            if parse(html, backend) != reference:
+                raise SystemExit(f"{backend} output differs from {args.backends[0]} on the {name} page")
+            seconds = best_time(lambda: parse(html, backend), args.repeat)
+            baseline = baseline or seconds
+            print(f"{name:<10}{backend:<14}{seconds:>10.3f}{baseline / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import pandas as pd
+
+
+class DimensionTable:
+    """
+    A keyed dimension table (e.g. province_id -> GDP/inflation). With `valid_from` it keeps
+    several versions per key and a join picks the version in effect at a given date.
+    """
+
+    def __init__(self, name, df, key, valid_from=None):
+        self.name = name
+        self.key = key
+        self.valid_from = valid_from
+        if valid_from is not None:
+            df = df.assign(**{valid_from: pd.to_datetime(df[valid_from])})
+            df = df.sort_values([valid_from, key], kind="stable").reset_index(drop=True)
+        self.df = df
+        self.attributes = [column for column in df.columns if column not in (key, valid_from)]
+        self.lookup_cache = {}
+
+    @classmethod
+    def from_mapping(cls, name, mapping, key, valid_from=None):
+        """Build from {key: {attribute: value}}, the shape the task modules already use."""
+        df = pd.DataFrame.from_dict(mapping, orient="index")
+        df.index.name = key
+        return cls(name, df.reset_index(), key, valid_from)
+
+    def as_of(self, when=None):
+        """One row per key: the latest version with valid_from <= when (or the latest overall)."""
+        if self.valid_from is None:
+            return self.df
+        df = self.df
+        if when is not None:
+            df = df[df[self.valid_from] <= pd.Timestamp(when)]
+        return df.drop_duplicates(self.key, keep="last")
+
+    def lookup(self, key, when=None):
+        """Hash lookup of one key's attributes, for row-at-a-time (streaming) joins."""
+        if when not in self.lookup_cache:
+            snapshot = self.as_of(when)
+            self.lookup_cache[when] = snapshot.set_index(self.key)[self.attributes].to_dict("index")
+        return self.lookup_cache[when].get(key, {})
+
+
+def join(facts, dimension, on=None, how="left", as_of=None, time_column=None):
+    """
+    Vectorized hash join of a fact DataFrame with a dimension.
+
+    as_of:       join the dimension version in effect at this date (default: latest).
+    time_column: point-in-time join instead, each fact row getting the version in effect at its
+                 own timestamp in `time_column` (requires a versioned dimension).
+    """
+    on = on or dimension.key
+    if time_column is not None:
+        right = dimension.df.rename(columns={dimension.key: on})
+        left = facts.assign(**{time_column: pd.to_datetime(facts[time_column])})
+        left = left.reset_index().sort_values(time_column, kind="stable")
+        joined = pd.merge_asof(left, right, left_on=time_column, right_on=dimension.valid_from, by=on)
+        return joined.sort_values("index").drop(columns=["index", dimension.valid_from]).reset_index(drop=True)
+
+    right = dimension.as_of(as_of)[[dimension.key] + dimension.attributes]
+    if on != dimension.key:
+        right = right.rename(columns={dimension.key: on})
+    return facts.merge(right, on=on, how=how)
+
+
+class LazyJoinView:
+    """
+    Keeps facts normalized (no repeated dimension values per row) and joins dimensions only at
+    query time, and only those whose attributes are actually requested.
+    """
+
+    def __init__(self, facts, dimensions):
+        self.facts = facts
+        self.dimensions = dimensions  # list of (DimensionTable, fact column it joins on)
+
+    def query(self, columns=None, where=None, as_of=None):
+        """
+        columns: output columns (fact or dimension attributes); all when None.
+        where:   pandas query string evaluated on the fact columns before joining.
+        """
+        facts = self.facts.query(where) if where else self.facts
+        for dimension, on in self.dimensions:
+            if columns is None or any(column in dimension.attributes for column in columns):
+                facts = join(facts, dimension, on=on, as_of=as_of)
+        return facts if columns is None else facts[columns]
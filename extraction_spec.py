@@ -0,0 +1,114 @@
+import re
+from collections import Counter
+
+_CLASS_SELECTOR = re.compile(r"\.([\w-]+)")
+_RUPIAH = re.compile(r"Rp\s*(\d{1,3}(?:\.\d{3})+|\d+)(?:,\d+)?")
+_DECIMAL = re.compile(r"\d+(?:[.,]\d+)?")
+_COUNT = re.compile(r"\d{1,3}(?:\.\d{3})+|\d+")
+
+
+def parse_text(text):
+    return text.strip()
+
+
+def parse_rupiah(text):
+    """'Rp 5.999.000' / 'Rp5.999.000,00' -> 5999000"""
+    match = _RUPIAH.search(text)
+    if match is None:
+        raise ValueError(f"no rupiah amount in {text!r}")
+    return int(match.group(1).replace(".", ""))
+
+
+def parse_decimal(text):
+    """'4.8' / '4,8' / 'Rating 4.8' -> 4.8"""
+    match = _DECIMAL.search(text)
+    if match is None:
+        raise ValueError(f"no number in {text!r}")
+    return float(match.group().replace(",", "."))
+
+
+def parse_count(text):
+    """'128 ulasan' / '1.204 ulasan' -> 1204"""
+    match = _COUNT.search(text)
+    if match is None:
+        raise ValueError(f"no count in {text!r}")
+    return int(match.group().replace(".", ""))
+
+
+class Field:
+    def __init__(self, name, selector, parse=parse_text):
+        match = _CLASS_SELECTOR.fullmatch(selector)
+        if match is None:
+            raise ValueError(f"Field selectors must be a single class (e.g. '.product-price'), got {selector!r}")
+        self.name = name
+        self.css_class = match.group(1)
+        self.parse = parse
+
+
+class ExtractionSpec:
+    """
+    Declarative description of the records on a page: an item selector plus one Field per value.
+
+    Field selectors are compiled into a class -> field table, so each item is walked once and
+    every value is picked up on the way, instead of one select_one query per field. Failures are
+    tallied per field in `missing` (no element) and `invalid` (parser raised ValueError) rather
+    than raised; an item with any failed field is skipped.
+    """
+
+    def __init__(self, item_selector, fields):
+        self.item_selector = item_selector
+        self.fields = fields
+        self.by_class = {field.css_class: field for field in fields}
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.missing = Counter()
+        self.invalid = Counter()
+        self.extracted = 0
+        self.skipped = 0
+
+    def extract(self, item):
+        texts = {}
+        for classes, node in item.iter_elements():
+            for css_class in classes:
+                field = self.by_class.get(css_class)
+                if field is not None and field.name not in texts:
+                    texts[field.name] = node.text
+        record = {}
+        for field in self.fields:
+            text = texts.get(field.name)
+            if text is None:
+                self.missing[field.name] += 1
+                continue
+            try:
+                record[field.name] = field.parse(text)
+            except ValueError:
+                self.invalid[field.name] += 1
+        if len(record) < len(self.fields):
+            self.skipped += 1
+            return None
+        self.extracted += 1
+        return record
+
+    def extract_all(self, root):
+        """Yield a record dict for every well-formed item under `root` (an html_backends node)."""
+        for item in root.select(self.item_selector):
+            record = self.extract(item)
+            if record is not None:
+                yield record
+
+    def counters(self):
+        """Picklable snapshot of the counters, e.g. to send back from a worker process."""
+        return {"extracted": self.extracted, "skipped": self.skipped,
+                "missing": dict(self.missing), "invalid": dict(self.invalid)}
+
+    def merge(self, counters):
+        """Add another spec's counters() (same fields) into this one."""
+        self.extracted += counters["extracted"]
+        self.skipped += counters["skipped"]
+        self.missing.update(counters["missing"])
+        self.invalid.update(counters["invalid"])
+
+    def error_report(self):
+        return {field.name: {"missing": self.missing[field.name], "invalid": self.invalid[field.name]}
+                for field in self.fields if self.missing[field.name] or self.invalid[field.name]}
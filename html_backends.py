@@ -0,0 +1,119 @@
+import re
+
+from bs4 import BeautifulSoup
+
+# Backends accepted by the scrapers' `parser` argument:
+#   "html.parser"  BeautifulSoup with Python's built-in parser (the original behaviour)
+#   "soup-lxml"    BeautifulSoup tree built by the C lxml parser
+#   "lxml"         native lxml tree queried with precompiled XPath (no BeautifulSoup objects)
+BACKENDS = ("html.parser", "soup-lxml", "lxml")
+
+
+class SoupNode:
+    """
+    Thin wrapper so scrapers can use one small API (select / select_one / get_text) on any backend.
+    """
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def select(self, css):
+        return [SoupNode(tag) for tag in self.tag.select(css)]
+
+    def select_one(self, css):
+        tag = self.tag.select_one(css)
+        return SoupNode(tag) if tag is not None else None
+
+    def get_text(self, strip=False):
+        return self.tag.get_text(strip=strip)
+
+    def iter_elements(self):
+        """Yield (class list, node) for every descendant element, in document order."""
+        for tag in self.tag.find_all(True):
+            yield tag.get("class") or (), SoupNode(tag)
+
+    @property
+    def text(self):
+        return self.tag.get_text()
+
+
+_SIMPLE_SELECTOR = re.compile(r"^(?P<tag>[a-zA-Z][\w-]*)?(?P<rest>(?:[.#][\w-]+)*)$")
+_xpath_cache = {}
+# BeautifulSoup's get_text leaves out script/style/template contents; select the same text nodes
+_VISIBLE_TEXT = ".//text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+
+
+def css_to_xpath(css):
+    """
+    Translate the selector subset the scrapers use (tag, .class, #id, descendant combinator)
+    into a relative XPath expression.
+    """
+    steps = []
+    for part in css.split():
+        match = _SIMPLE_SELECTOR.match(part)
+        if match is None:
+            raise ValueError(f"Unsupported selector for the lxml backend: {css!r}")
+        conditions = []
+        for kind, name in re.findall(r"([.#])([\w-]+)", match.group("rest")):
+            if kind == ".":
+                conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')")
+            else:
+                conditions.append(f"@id='{name}'")
+        step = match.group("tag") or "*"
+        if conditions:
+            step += "[" + " and ".join(conditions) + "]"
+        steps.append(step)
+    return ".//" + "//".join(steps)
+
+
+def _compiled_xpath(css, raw=False):
+    """Compile (once) the XPath for a CSS selector, or `css` itself as XPath when raw=True."""
+    if css not in _xpath_cache:
+        from lxml import etree
+        _xpath_cache[css] = etree.XPath(css if raw else css_to_xpath(css))
+    return _xpath_cache[css]
+
+
+class LxmlNode:
+    def __init__(self, element):
+        self.element = element
+
+    def select(self, css):
+        return [LxmlNode(element) for element in _compiled_xpath(css)(self.element)]
+
+    def select_one(self, css):
+        elements = _compiled_xpath(css)(self.element)
+        return LxmlNode(elements[0]) if elements else None
+
+    def get_text(self, strip=False):
+        # Matches BeautifulSoup.get_text: strip=True strips each text piece and drops empty ones
+        pieces = _compiled_xpath(_VISIBLE_TEXT, raw=True)(self.element)
+        if strip:
+            return "".join(piece.strip() for piece in pieces if piece.strip())
+        return "".join(pieces)
+
+    def iter_elements(self):
+        from lxml import etree
+        # tag=etree.Element skips comments and processing instructions, as find_all(True) does
+        for element in self.element.iterdescendants(tag=etree.Element):
+            yield element.get("class", "").split(), LxmlNode(element)
+
+    @property
+    def text(self):
+        return self.get_text()
+
+
+def parse_document(html, parser="html.parser"):
+    """
+    Parse `html` with the chosen backend and return the root node.
+    """
+    if parser == "html.parser":
+        return SoupNode(BeautifulSoup(html, "html.parser"))
+    if parser == "soup-lxml":
+        return SoupNode(BeautifulSoup(html, "lxml"))
+    if parser == "lxml":
+        import lxml.html
+        if not html or not html.strip():
+            html = "<html></html>"
+        return LxmlNode(lxml.html.document_fromstring(html))
+    raise ValueError(f"Unknown parser backend {parser!r}; choose from {BACKENDS}")
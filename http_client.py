@@ -0,0 +1,148 @@
+import asyncio
+import atexit
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+
+class HTTPClientError(Exception):
+    """Connection failure, timeout, or (from raise_for_status) a 4xx/5xx response."""
+
+
+class HTTPResponse:
+    """
+    Fully-read response with the parts of requests.Response the task modules use.
+    """
+
+    def __init__(self, url, status_code, headers, content, encoding="utf-8"):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPClientError(f"{self.status_code} error for url: {self.url}")
+
+
+class AsyncHTTPClient:
+    """
+    asyncio HTTP client with keep-alive connection pooling, a per-host concurrency limit and
+    optional per-host politeness spacing. aiohttp speaks HTTP/1.1, so connections are reused
+    rather than multiplexed.
+
+    The limits apply to every host unless overridden with set_host_policy(); a host's
+    max_per_host cannot exceed the connector's limit_per_host (the client-wide value).
+    """
+
+    def __init__(self, max_connections=100, max_per_host=8, min_interval=0.0, timeout=10, headers=None):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval  # seconds between request starts on the same host
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.session = None
+        self.host_semaphores = {}
+        self.next_start = {}
+        self.host_policies = {}  # host -> {"max_per_host": n, "min_interval": seconds}
+
+    def set_host_policy(self, host, max_per_host=None, min_interval=None):
+        policy = self.host_policies.setdefault(host, {})
+        if max_per_host is not None:
+            policy["max_per_host"] = max_per_host
+            self.host_semaphores.pop(host, None)  # recreated with the new size on the next request
+        if min_interval is not None:
+            policy["min_interval"] = min_interval
+
+    async def _get_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_per_host,
+                                             keepalive_timeout=30)
+            self.session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        return self.session
+
+    async def _wait_turn(self, host):
+        # Runs on the event loop thread, so no lock is needed to reserve a start slot
+        now = time.monotonic()
+        start = max(now, self.next_start.get(host, now))
+        self.next_start[host] = start + self.host_policies.get(host, {}).get("min_interval", self.min_interval)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def get(self, url, headers=None, params=None, timeout=None):
+        host = urlparse(url).netloc
+        if host not in self.host_semaphores:
+            limit = self.host_policies.get(host, {}).get("max_per_host", self.max_per_host)
+            self.host_semaphores[host] = asyncio.Semaphore(limit)
+        session = await self._get_session()
+        async with self.host_semaphores[host]:
+            await self._wait_turn(host)
+            try:
+                client_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+                async with session.get(url, headers=headers, params=params, timeout=client_timeout) as response:
+                    content = await response.read()
+                    return HTTPResponse(str(response.url), response.status, dict(response.headers),
+                                        content, response.charset or "utf-8")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise HTTPClientError(f"Request to {url} failed: {e!r}") from e
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+
+class HTTPClient:
+    """
+    Blocking facade over AsyncHTTPClient for the existing synchronous classes. The async client
+    runs on a background event loop thread; get() is safe to call from any thread.
+    """
+
+    def __init__(self, **kwargs):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.async_client = AsyncHTTPClient(**kwargs)
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        future = asyncio.run_coroutine_threadsafe(
+            self.async_client.get(url, headers=headers, params=params, timeout=timeout), self.loop)
+        return future.result()
+
+    def set_host_policy(self, url, max_per_host=None, min_interval=None):
+        """
+        Per-host politeness for `url`'s host (a bare host name works too): at most `max_per_host`
+        requests in flight and request starts at least `min_interval` seconds apart.
+        """
+        host = urlparse(url).netloc or url
+        self.loop.call_soon_threadsafe(self.async_client.set_host_policy, host, max_per_host, min_interval)
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.async_client.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    The process-wide client shared by all task modules, so they reuse pooled connections.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+            atexit.register(_default_client.close)
+        return _default_client
@@ -0,0 +1,85 @@
+from collections import Counter, deque
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a lexicon of {term: polarity}. Built once, it finds every lexicon
+    term in a single left-to-right pass over the text, so matching cost grows with the text, not
+    with the lexicon size. Matches must be whole words: "turun" matches in "ekspor turun" but not
+    inside "diturunkan". Terms may contain spaces ("tidak stabil"). Matching is case-insensitive.
+
+    counts/found/score use leftmost-longest, non-overlapping matches, so "tidak stabil" counts
+    once with its own polarity instead of also counting the "stabil" inside it.
+    """
+
+    def __init__(self, lexicon):
+        self.terms = [term.lower() for term in lexicon]
+        self.polarity = {term.lower(): score for term, score in lexicon.items()}
+        self.goto = [{}]  # state -> {char: next state}
+        self.fail = [0]
+        self.output = [[]]  # state -> term ids ending here, including those reached via fail links
+        for term_id, term in enumerate(self.terms):
+            state = 0
+            for ch in term:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state].append(term_id)
+        self._link_failures()
+
+    def _link_failures(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def iter_all_matches(self, text):
+        """
+        Yield (start, end, term) for every whole-word occurrence, overlapping ones included, in
+        order of end offset; offsets index into text.lower().
+        """
+        text = text.lower()
+        goto, fail, output, terms = self.goto, self.fail, self.output, self.terms
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state] and (i + 1 == len(text) or not _is_word_char(text[i + 1])):
+                for term_id in output[state]:
+                    start = i + 1 - len(terms[term_id])
+                    if start == 0 or not _is_word_char(text[start - 1]):
+                        yield start, i + 1, terms[term_id]
+
+    def iter_matches(self, text):
+        """Yield (start, end, term) for the leftmost-longest non-overlapping matches, in text order."""
+        last_end = 0
+        for start, end, term in sorted(self.iter_all_matches(text), key=lambda match: (match[0], -match[1])):
+            if start >= last_end:
+                last_end = end
+                yield start, end, term
+
+    def counts(self, text):
+        """Counter of term -> occurrences in `text`."""
+        return Counter(term for _, _, term in self.iter_matches(text))
+
+    def found(self, text):
+        """Distinct matched terms in order of first occurrence."""
+        return list(dict.fromkeys(term for _, _, term in self.iter_matches(text)))
+
+    def score(self, text):
+        """Sum of polarity over all occurrences (positive > 0, negative < 0)."""
+        return sum(self.polarity[term] for _, _, term in self.iter_matches(text))
@@ -0,0 +1,106 @@
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from http_client import HTTPResponse, get_default_client
+
+
+class PageArchive:
+    """
+    Append-only archive of fetched pages, in the spirit of WARC: every response is written to
+    `pages.gz` as its own gzip member (a JSON header line followed by the raw body), and a
+    SQLite index maps URL -> (offset, length) so a single page is read back with one seek.
+
+    With replay=True the scrapers read pages from here instead of the network.
+    """
+
+    def __init__(self, path="page_archive", replay=False):
+        self.path = path
+        self.replay = replay
+        os.makedirs(path, exist_ok=True)
+        self.data_path = os.path.join(path, "pages.gz")
+        self.lock = threading.Lock()
+        self.data = open(self.data_path, "ab")
+        self.conn = sqlite3.connect(os.path.join(path, "index.db"), check_same_thread=False)
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS pages (
+                                id INTEGER PRIMARY KEY, url TEXT, fetched_at REAL, status_code INTEGER,
+                                offset INTEGER, length INTEGER)""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_url ON pages (url, fetched_at)")
+        self.conn.commit()
+
+    def record(self, url, response):
+        """Append the HTTPResponse fetched for `url` to the archive."""
+        header = {
+            "url": url,
+            "fetched_at": time.time(),
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+        }
+        member = gzip.compress(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n" + response.content)
+        with self.lock:
+            offset = self.data.seek(0, os.SEEK_END)
+            self.data.write(member)
+            self.data.flush()
+            self.conn.execute("INSERT INTO pages (url, fetched_at, status_code, offset, length) VALUES (?, ?, ?, ?, ?)",
+                              (url, header["fetched_at"], response.status_code, offset, len(member)))
+            self.conn.commit()
+
+    @staticmethod
+    def _decode(member):
+        header, body = zlib.decompress(member, wbits=31).split(b"\n", 1)
+        header = json.loads(header)
+        return header, HTTPResponse(header["url"], header["status_code"], header["headers"], body,
+                                    header["encoding"])
+
+    def get(self, url):
+        """Latest archived response for `url` (an HTTPResponse), or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT offset, length FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1",
+                                    (url,)).fetchone()
+        if row is None:
+            return None
+        with open(self.data_path, "rb") as f:
+            f.seek(row[0])
+            return self._decode(f.read(row[1]))[1]
+
+    def iter_records(self, url_prefix=""):
+        """
+        Yield (header, HTTPResponse) for every archived page whose URL starts with `url_prefix`,
+        in the order they were recorded. The data file is read front to back, so replaying a
+        whole crawl runs at sequential disk speed.
+        """
+        with self.lock:
+            rows = self.conn.execute("SELECT offset, length FROM pages WHERE substr(url, 1, ?) = ? ORDER BY offset",
+                                     (len(url_prefix), url_prefix)).fetchall()
+        with open(self.data_path, "rb") as f:
+            for offset, length in rows:
+                if f.tell() != offset:
+                    f.seek(offset)
+                yield self._decode(f.read(length))
+
+    def stats(self):
+        with self.lock:
+            pages, urls = self.conn.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM pages").fetchone()
+        return {"pages": pages, "urls": urls, "bytes": os.path.getsize(self.data_path)}
+
+    def close(self):
+        self.data.close()
+        self.conn.close()
+
+
+def fetch_page(url, archive=None, timeout=10):
+    """
+    GET `url` through the shared client, recording the response when an archive is given.
+    In replay mode the archived response is returned instead (None if the URL was never archived).
+    """
+    if archive is not None and archive.replay:
+        return archive.get(url)
+    response = get_default_client().get(url, timeout=timeout)
+    if archive is not None:
+        archive.record(url, response)
+    return response
@@ -0,0 +1,125 @@
+import argparse
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+# Worker entry points live at module level so they can be pickled into the pool processes.
+# Each returns (records, counters): counters are the product spec's per-field error counts
+# (ExtractionSpec.counters()) so the parent can merge them, or None for other page kinds.
+
+_scrapers = {}  # (scraper class, parser) -> instance, built once per worker process
+
+
+def _worker_scraper(scraper_class, parser):
+    """The worker's scraper for this parser, so its spec and keyword matcher are compiled only once."""
+    key = (scraper_class, parser)
+    if key not in _scrapers:
+        _scrapers[key] = scraper_class(parser=parser)
+    return _scrapers[key]
+
+
+def parse_products_page(html, category, parser="html.parser"):
+    from task5_ecommerce_scraping import IndonesianEcommerceScraper
+    scraper = _worker_scraper(IndonesianEcommerceScraper, parser)
+    scraper.products, scraper.product_index = [], {}
+    scraper.product_spec.reset_counters()
+    scraper.parse_products(html, category)
+    return scraper.products, scraper.product_spec.counters()
+
+
+def parse_articles_page(html, category, parser="html.parser"):
+    from task6_news_scraping import IndonesianNewsScraper
+    scraper = _worker_scraper(IndonesianNewsScraper, parser)
+    scraper.news_data = []
+    scraper.parse_articles(html, category)
+    return scraper.news_data, None
+
+
+def parse_weather_page(html, category=None, parser="html.parser"):
+    from task3_scraping_basics import WeatherScraper
+    scraper = WeatherScraper(html, parser=parser)
+    scraper.parse_html()
+    return scraper.weather_data, None
+
+
+PAGE_PARSERS = {
+    "products": parse_products_page,
+    "articles": parse_articles_page,
+    "weather": parse_weather_page,
+}
+
+
+class ParsePool:
+    """
+    Process-pool parsing stage: (html, category) pages go in, per-page record lists come back
+    in input order. At most `max_pending` pages are queued, so a slow consumer or a fast
+    fetcher never piles up unparsed HTML in memory.
+    """
+
+    def __init__(self, kind, workers=None, parser="html.parser", max_pending=None):
+        self.parse_page = PAGE_PARSERS[kind]
+        self.workers = workers or os.cpu_count() or 1
+        self.parser = parser
+        self.max_pending = max_pending or self.workers * 4
+        self.executor = None
+
+    def __enter__(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc):
+        self.executor.shutdown(cancel_futures=True)
+
+    def imap(self, pages):
+        """Yield (records, counters) for each (html, category) page, in the order pages were given."""
+        pending = deque()
+        for html, category in pages:
+            pending.append(self.executor.submit(self.parse_page, html, category, self.parser))
+            if len(pending) >= self.max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_saved_pages(directory, pattern="*.html", category=None):
+    """
+    Yield (html, category) for saved pages in sorted path order. The category defaults to
+    each file's parent directory name, e.g. pages/elektronik/page1.html -> "elektronik".
+    """
+    for path in sorted(Path(directory).rglob(pattern)):
+        yield path.read_text(encoding="utf-8"), category or path.parent.name
+
+
+def reparse_directory(directory, kind, workers=None, parser="html.parser", pattern="*.html", category=None):
+    """Re-parse a directory of saved pages across all cores, streaming records in page order."""
+    with ParsePool(kind, workers, parser) as pool:
+        for records, _ in pool.imap(iter_saved_pages(directory, pattern, category)):
+            yield from records
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Re-parse a directory of saved HTML pages into a CSV.")
+    cli.add_argument("directory")
+    cli.add_argument("--kind", choices=sorted(PAGE_PARSERS), default="products")
+    cli.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    cli.add_argument("--parser", default="html.parser", help="html_backends backend")
+    cli.add_argument("--out", default="reparsed.csv")
+    args = cli.parse_args()
+
+    start = time.perf_counter()
+    count = 0
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = None
+        for record in reparse_directory(args.directory, args.kind, args.workers, args.parser):
+            if not isinstance(record, dict):
+                record = {slot: getattr(record, slot) for slot in record.__slots__}
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(record))
+                writer.writeheader()
+            writer.writerow(record)
+            count += 1
+    print(f"[INFO] Parsed {count} records into '{args.out}' in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,107 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+
+def product_key(name, seller_location):
+    """Stable id for a listing: the same product from the same seller location maps to the same key
+    across pages and runs (unlike hash(), which is salted per process)."""
+    normalized = " ".join(name.casefold().split()) + "\x1f" + " ".join(seller_location.casefold().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+class ProductStore:
+    """
+    SQLite store of scraped products keyed by product_key, with an append-only price history.
+
+    A history row is written only when a product's price differs from its stored price, so
+    re-scraping unchanged listings costs an upsert of `last_seen` and nothing more.
+    """
+
+    def __init__(self, path="products.db"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS products (
+                                product_id TEXT PRIMARY KEY, name TEXT, seller_location TEXT, category TEXT,
+                                price INTEGER, rating REAL, reviews_count INTEGER,
+                                first_seen REAL, last_seen REAL)""")
+        # Clustered on (product_id, observed_at): one product's history is a contiguous range scan
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS price_history (
+                                product_id TEXT, observed_at REAL, price INTEGER,
+                                PRIMARY KEY (product_id, observed_at)) WITHOUT ROWID""")
+        self.conn.commit()
+
+    def upsert_many(self, products, observed_at=None):
+        """
+        Insert or update products (dicts as produced by parse_products) in one transaction.
+        Returns the number of price-history rows written (new products plus price changes).
+        """
+        observed_at = time.time() if observed_at is None else observed_at
+        latest = {}
+        for product in products:
+            latest[product_key(product["name"], product["seller_location"])] = product  # last copy wins
+        rows = [(key, p["name"], p["seller_location"], p["category"], p["price"], p["rating"],
+                 p["reviews_count"], observed_at) for key, p in latest.items()]
+        with self.lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany("""INSERT OR IGNORE INTO price_history (product_id, observed_at, price)
+                                     SELECT ?1, ?2, ?3 WHERE ?3 IS NOT
+                                         (SELECT price FROM products WHERE product_id = ?1)""",
+                                  [(row[0], observed_at, row[4]) for row in rows])
+            changed = self.conn.total_changes - before
+            self.conn.executemany("""INSERT INTO products VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?8)
+                                     ON CONFLICT (product_id) DO UPDATE SET
+                                         name = excluded.name, category = excluded.category,
+                                         price = excluded.price, rating = excluded.rating,
+                                         reviews_count = excluded.reviews_count, last_seen = excluded.last_seen""",
+                                  rows)
+        return changed
+
+    def get(self, product_id):
+        with self.lock:
+            cursor = self.conn.execute("SELECT * FROM products WHERE product_id = ?", (product_id,))
+            row = cursor.fetchone()
+        return dict(zip([column[0] for column in cursor.description], row)) if row else None
+
+    def history(self, product_id):
+        """[(observed_at, price), ...] oldest first."""
+        with self.lock:
+            return self.conn.execute("SELECT observed_at, price FROM price_history WHERE product_id = ? "
+                                     "ORDER BY observed_at", (product_id,)).fetchall()
+
+    def price_changes(self, days=30, now=None, changed_only=True):
+        """
+        Price change per product over the last `days` days: the price in effect `days` ago (or the
+        first price seen inside the window, for newer listings) against the current price.
+        Each lookup is a range probe on the price_history primary key.
+        """
+        cutoff = (time.time() if now is None else now) - days * 86400
+        query = """
+            SELECT product_id, name, seller_location, category, old_price, price AS new_price,
+                   price - old_price AS change, ROUND(100.0 * (price - old_price) / old_price, 2) AS change_pct
+            FROM (SELECT p.*, COALESCE(
+                      (SELECT h.price FROM price_history h WHERE h.product_id = p.product_id
+                           AND h.observed_at <= :cutoff ORDER BY h.observed_at DESC LIMIT 1),
+                      (SELECT h.price FROM price_history h WHERE h.product_id = p.product_id
+                           AND h.observed_at > :cutoff ORDER BY h.observed_at LIMIT 1)) AS old_price
+                  FROM products p WHERE p.last_seen > :cutoff)
+            WHERE old_price IS NOT NULL AND (:all OR price != old_price)
+            ORDER BY change_pct"""
+        with self.lock:
+            return pd.read_sql_query(query, self.conn, params={"cutoff": cutoff, "all": not changed_only})
+
+    def to_dataframe(self):
+        with self.lock:
+            return pd.read_sql_query("SELECT * FROM products ORDER BY category, name", self.conn)
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
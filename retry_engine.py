@@ -0,0 +1,194 @@
+import asyncio
+import random
+import threading
+import time
+from bisect import bisect_left
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from http_client import HTTPClientError, get_default_client
+
+
+class RetryError(Exception):
+    """All attempts failed; carries the last response (if any) and the last exception (if any)."""
+
+    def __init__(self, message, response=None, error=None):
+        super().__init__(message)
+        self.response = response
+        self.error = error
+
+
+class CircuitOpenError(RetryError):
+    """The host's circuit breaker is open, so the request was not sent."""
+
+
+class RetryPolicy:
+    """
+    Which outcomes are retried and how long to wait between attempts.
+    Client errors other than 408/429 are returned immediately instead of being retried.
+    """
+
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=30.0, max_retry_after=120.0,
+                 retry_statuses=(408, 429, 500, 502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after  # upper bound on a server-supplied Retry-After
+        self.retry_statuses = set(retry_statuses)
+
+    def should_retry(self, status_code):
+        return status_code in self.retry_statuses
+
+    def next_delay(self, previous_delay):
+        # "Decorrelated jitter": random between the base and 3x the previous delay, capped
+        return min(self.max_delay, random.uniform(self.base_delay, max(previous_delay, self.base_delay) * 3))
+
+    def retry_after(self, response):
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(seconds, 0.0), self.max_retry_after)
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: opens after `failure_threshold` consecutive failures, then lets a single
+    trial request through once `reset_timeout` seconds have passed.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = {}
+        self.opened_at = {}
+        self.lock = threading.Lock()
+
+    def allow(self, host):
+        with self.lock:
+            opened_at = self.opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at >= self.reset_timeout:
+                self.opened_at[host] = time.monotonic()  # half-open: one trial per timeout window
+                return True
+            return False
+
+    def record_success(self, host):
+        with self.lock:
+            self.failures.pop(host, None)
+            self.opened_at.pop(host, None)
+
+    def record_failure(self, host):
+        with self.lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+            if self.failures[host] >= self.failure_threshold and host not in self.opened_at:
+                self.opened_at[host] = time.monotonic()
+
+    def state(self, host):
+        with self.lock:
+            return "open" if host in self.opened_at else "closed"
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] holds observations <= bounds[i], the last bucket is +inf."""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        with self.lock:
+            self.counts[bisect_left(self.bounds, value)] += 1
+            self.total += value
+
+    def snapshot(self):
+        with self.lock:
+            labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+            return {"buckets": dict(zip(labels, self.counts)), "count": sum(self.counts), "sum": self.total}
+
+
+class RetryEngine:
+    """
+    Status-aware retries with decorrelated jitter, Retry-After support and a per-host circuit
+    breaker, on top of the shared HTTP client. Waits are asyncio sleeps on the client's event
+    loop, so a retrying request does not hold up other requests.
+    """
+
+    def __init__(self, policy=None, breaker=None, client=None):
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.client = client or get_default_client()
+        self.attempts = Histogram([1, 2, 3, 4, 6, 8])  # attempts needed per call
+        self.latency = Histogram([0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30])  # seconds per call, waits included
+
+    async def get_async(self, url, headers=None, params=None, timeout=None, max_attempts=None):
+        host = urlparse(url).netloc
+        max_attempts = max_attempts or self.policy.max_attempts
+        started = time.monotonic()
+        delay = self.policy.base_delay
+        response = error = None
+        attempt = sent = 0
+        try:
+            for attempt in range(1, max_attempts + 1):
+                if not self.breaker.allow(host):
+                    raise CircuitOpenError(f"Circuit open for {host}; not requesting {url}", response, error)
+                sent += 1
+                try:
+                    response = await self.client.async_client.get(url, headers=headers, params=params,
+                                                                  timeout=timeout)
+                    error = None
+                except HTTPClientError as e:
+                    response, error = None, e
+                    self.breaker.record_failure(host)
+                else:
+                    if not self.policy.should_retry(response.status_code):
+                        self.breaker.record_success(host)
+                        return response
+                    if response.status_code >= 500:
+                        self.breaker.record_failure(host)
+
+                if attempt == max_attempts:
+                    break
+                delay = self.policy.next_delay(delay)
+                wait = self.policy.retry_after(response)
+                await asyncio.sleep(delay if wait is None else wait)
+
+            status = response.status_code if response is not None else error
+            raise RetryError(f"Giving up on {url} after {attempt} attempt(s): {status}", response, error)
+        finally:
+            # Calls short-circuited by an open breaker before any request was sent are not observed
+            if sent:
+                self.attempts.observe(sent)
+                self.latency.observe(time.monotonic() - started)
+
+    def get(self, url, headers=None, params=None, timeout=None, max_attempts=None):
+        """Blocking call for synchronous code; the retries themselves run on the client's event loop."""
+        future = asyncio.run_coroutine_threadsafe(
+            self.get_async(url, headers=headers, params=params, timeout=timeout, max_attempts=max_attempts),
+            self.client.loop)
+        return future.result()
+
+    def metrics(self):
+        return {"attempts": self.attempts.snapshot(), "latency": self.latency.snapshot()}
+
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+
+def get_default_engine():
+    """The process-wide engine, so circuit breaker state and histograms are shared."""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = RetryEngine()
+        return _default_engine
@@ -27,6 +27,8 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 import urllib.parse
 import csv
+from dimension_join import DimensionTable, join
+from retry_engine import RetryError, get_default_engine
 
 print("🇮🇩 STEP-BY-STEP GUIDE: WEB SCRAPING AND API")
 print("=" * 60)
@@ -510,58 +512,40 @@ def step6_error_handling():
                 'User-Agent': 'Indonesian-Educational-Bot/1.0'
             })
             self.errors = []
+            # Shared engine: jittered backoff, Retry-After on 429, per-host circuit breaker
+            self.retry_engine = get_default_engine()
         
         def scrape_with_error_handling(self, url, max_retries=3):
             """Scraping with comprehensive error handling"""
-            for attempt in range(max_retries):
-                try:
-                    print(f"🔄 Attempt {attempt + 1} for {url}")
-                    
-                    response = self.session.get(url, timeout=10)
-                    
-                    if response.status_code == 200:
-                        print(f"✅ Successfully accessed {url}")
-                        return response
-                    
-                    elif response.status_code == 429:
-                        print("⚠️ Rate limited, waiting longer...")
-                        time.sleep(60)  # Wait 1 minute for rate limit
-                        continue
-                    
-                    elif response.status_code == 404:
-                        print("❌ Page not found (404)")
-                        self.errors.append(f"404 error for {url}")
-                        return None
-                    
-                    else:
-                        print(f"⚠️ Unexpected status code: {response.status_code}")
-                        
-                except requests.exceptions.Timeout:
-                    print(f"⏰ Timeout on attempt {attempt + 1}")
-                    self.errors.append(f"Timeout for {url} on attempt {attempt + 1}")
-                    
-                except requests.exceptions.ConnectionError:
-                    print(f"🔌 Connection error on attempt {attempt + 1}")
-                    self.errors.append(f"Connection error for {url} on attempt {attempt + 1}")
-                    
-                except Exception as e:
-                    print(f"❌ Unexpected error: {str(e)}")
-                    self.errors.append(f"Unexpected error for {url}: {str(e)}")
-                
-                # Exponential backoff
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    print(f"⏳ Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
+            print(f"🔄 Requesting {url} (up to {max_retries} attempts)")
+            try:
+                response = self.retry_engine.get(url, headers=dict(self.session.headers),
+                                                 timeout=10, max_attempts=max_retries)
+            except RetryError as e:
+                print(f"❌ {e}")
+                self.errors.append(str(e))
+                return None
+            
+            if response.status_code == 200:
+                print(f"✅ Successfully accessed {url}")
+                return response
+            
+            elif response.status_code == 404:
+                print("❌ Page not found (404)")
+                self.errors.append(f"404 error for {url}")
             
-            print(f"❌ Failed to access {url} after {max_retries} attempts")
+            else:
+                # 4xx client errors are not worth retrying
+                print(f"⚠️ Unexpected status code: {response.status_code}")
+                self.errors.append(f"Status {response.status_code} for {url}")
             return None
         
         def get_error_summary(self):
             """Get error summary"""
             return {
                 'total_errors': len(self.errors),
-                'errors': self.errors
+                'errors': self.errors,
+                'retry_metrics': self.retry_engine.metrics()
             }
     
     # Test robust scraper
@@ -685,8 +669,9 @@ def step7_combining_data_sources():
             weather_df = pd.DataFrame(self.api_data['weather'])
             population_df = pd.DataFrame(self.scraped_data['population'])
             
-            # Merge data based on city
-            integrated_df = pd.merge(weather_df, population_df, on='city', how='inner')
+            # Merge data based on city (population is a city-keyed dimension)
+            population = DimensionTable('population', population_df, key='city')
+            integrated_df = join(weather_df, population, how='inner')
             
             # Add calculated fields
             integrated_df['population_density'] = integrated_df['population'] / integrated_df['area_km2']
@@ -725,30 +710,16 @@ def step7_combining_data_sources():
             'Bandung': {'tourist_attractions': 30, 'hotels': 320}
         }
         
-        enriched_data = []
+        # Join each source as a city-keyed dimension (vectorized, no per-row dict lookups)
+        enriched_df = pd.DataFrame(base_data)
+        for name, source in [('economic', economic_data), ('tourism', tourism_data)]:
+            enriched_df = join(enriched_df, DimensionTable.from_mapping(name, source, key='city'))
         
-        for city_data in base_data:
-            city_name = city_data['city']
-            
-            # Start with base data
-            enriched_record = city_data.copy()
-            
-            # Add economic data
-            if city_name in economic_data:
-                enriched_record.update(economic_data[city_name])
-            
-            # Add tourism data
-            if city_name in tourism_data:
-                enriched_record.update(tourism_data[city_name])
-            
-            # Calculate composite scores
-            if 'gdp_per_capita' in enriched_record and 'unemployment_rate' in enriched_record:
-                economic_score = (enriched_record['gdp_per_capita'] / 1000) * (10 - enriched_record['unemployment_rate'])
-                enriched_record['economic_score'] = round(economic_score, 2)
-            
-            enriched_data.append(enriched_record)
+        # Calculate composite scores
+        economic_score = (enriched_df['gdp_per_capita'] / 1000) * (10 - enriched_df['unemployment_rate'])
+        enriched_df['economic_score'] = economic_score.round(2)
         
-        return enriched_data
+        return enriched_df.to_dict('records')
     
     # Enrich the integrated data
     enriched_cities = enrich_indonesian_city_data(integrator.integrated_data)
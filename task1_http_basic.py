@@ -1,5 +1,5 @@
 # File: task1_http_basic.py
-import requests
+from http_client import HTTPClientError, get_default_client
 
 class IndonesianProvinceFetcher:
     def __init__(self, url="https://www.emsifa.com/api-wilayah-indonesia/api/provinces.json"):
@@ -9,10 +9,10 @@ class IndonesianProvinceFetcher:
     def fetch_provinces(self):
         """Fetch province data from the API and store it."""
         try:
-            response = requests.get(self.url)
+            response = get_default_client().get(self.url)
             response.raise_for_status()
             self.provinces = response.json()
-        except requests.exceptions.RequestException as e:
+        except HTTPClientError as e:
             print(f"Failed to fetch data: {e}")
             self.provinces = []
 
@@ -1,19 +1,106 @@
-import requests
+import heapq
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+from http_client import HTTPClientError, get_default_client
+from wilayah_crawler import WilayahCrawler
+
+# Common abbreviations expanded during normalization, so "Kab. Bandung" finds "KABUPATEN BANDUNG"
+NAME_ABBREVIATIONS = {"kab": "kabupaten", "kep": "kepulauan", "adm": "administrasi"}
+
+class RegencyNameIndex:
+    """
+    Trigram and word-prefix index over regency names for ranked fuzzy search and autocomplete.
+    """
+
+    def __init__(self, regencies, normalize):
+        self.regencies = regencies
+        self.normalize = normalize
+        self.trigram_counts = []
+        self.postings = {}  # trigram -> positions in regencies
+        tokens = []
+        for position, regency in enumerate(regencies):
+            name = normalize(regency['city_name'])
+            grams = self.trigrams(name)
+            self.trigram_counts.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+            tokens.extend((token, position) for token in set(name.split()))
+        tokens.sort()
+        self.tokens = [token for token, _ in tokens]
+        self.token_positions = [position for _, position in tokens]
+
+    @staticmethod
+    def trigrams(text):
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def prefix_matches(self, prefix):
+        """Positions of names with a word starting with `prefix` (binary search over sorted words)."""
+        matches = set()
+        i = bisect_left(self.tokens, prefix)
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix):
+            matches.add(self.token_positions[i])
+            i += 1
+        return matches
+
+    def search(self, query, limit=10):
+        """
+        Return up to `limit` regencies ranked by trigram similarity (Dice coefficient), with a boost
+        for names containing a word that starts with the last (possibly half-typed) query word.
+        """
+        query = self.normalize(query)
+        if not query:
+            return []
+        grams = self.trigrams(query)
+        overlap = Counter()
+        for gram in grams:
+            overlap.update(self.postings.get(gram, ()))
+        scores = {position: 2 * count / (len(grams) + self.trigram_counts[position])
+                  for position, count in overlap.items()}
+        for position in self.prefix_matches(query.split()[-1]):
+            scores[position] = scores.get(position, 0) + 0.5
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [{**self.regencies[position], 'score': round(score, 3)} for position, score in best]
+
+    def autocomplete(self, prefix, limit=10):
+        return [{key: value for key, value in match.items() if key != 'score'}
+                for match in self.search(prefix, limit)]
 
 class IndonesianCityAPI:
-    def __init__(self):
+    def __init__(self, cache_file="indonesian_regencies_index.json", max_age=7 * 24 * 3600, retry_interval=3600):
         self.base_url = "https://www.emsifa.com/api-wilayah-indonesia/api"
         self.headers = {
             "User-Agent": "CitySearchApp/1.0 (+https://yourdomain.com)"
         }
+        self.cache_file = cache_file
+        self.max_age = max_age  # seconds before the cached regency list is crawled again
+        self.retry_interval = retry_interval  # seconds before a failed refresh is attempted again
+        self.regencies = []
+        self.normalized_names = []
+        self.name_index = {}  # normalized name token -> positions in self.regencies
+        self.fuzzy_index = None
+        self.loaded_at = None
+
+    def get_provinces(self):
+        """
+        Get the list of all provinces from provinces.json.
+        """
+        url = f"{self.base_url}/provinces.json"
+        response = get_default_client().get(url, headers=self.headers)
+        response.raise_for_status()
+        return response.json()
 
     def get_cities_by_province_id(self, province_id):
         """
         Get all cities in a specific province by its ID.
-        Returns a list of city dictionaries.
+        Returns a list of city dictionaries, or None if the request failed.
         """
         url = f"{self.base_url}/regencies/{province_id}.json"
-        response = requests.get(url, headers=self.headers)
+        response = get_default_client().get(url, headers=self.headers)
 
         if response.status_code == 200:
             cities = response.json()
@@ -21,28 +108,127 @@ class IndonesianCityAPI:
             return cities
         else:
             print(f"Failed to fetch cities for province ID {province_id}. Status code: {response.status_code}")
-            return []
+            return None
+
+    @staticmethod
+    def normalize_name(name):
+        """
+        Lowercase, collapse punctuation and expand abbreviations, e.g. 'Kab. Bau-Bau' -> 'kabupaten bau bau'.
+        Only complete words (followed by '.' or a space) are expanded, so a half-typed 'Kep' stays
+        a prefix of KEPAHIANG as well as KEPULAUAN.
+        """
+        tokens = []
+        for token, separator in re.findall(r"(\w+)(\W*)", name.lower()):
+            if "." in separator or any(ch.isspace() for ch in separator):
+                token = NAME_ABBREVIATIONS.get(token, token)
+            tokens.append(token)
+        return " ".join(tokens)
+
+    def crawl_regencies(self):
+        """
+        Crawl every province listed in provinces.json and return all of its regencies.
+        Raises HTTPClientError if any province could not be fetched, rather than returning a
+        partial list.
+        """
+        crawler = WilayahCrawler(self.base_url, headers=self.headers)
+        regencies = list(crawler.iter_rows("regencies", provinces=self.get_provinces()))
+        if crawler.failures:
+            failed = ", ".join(str(failure["parent"]["province_id"]) for failure in crawler.failures)
+            raise HTTPClientError(f"Could not fetch regencies for province(s) {failed}")
+        return sorted(regencies, key=lambda row: row['city_id'])
+
+    def _build_index(self, regencies, fetched_at):
+        self.regencies = regencies
+        self.loaded_at = fetched_at
+        self.normalized_names = [self.normalize_name(regency['city_name']) for regency in regencies]
+        self.name_index = {}
+        for position, name in enumerate(self.normalized_names):
+            for token in set(name.split()):
+                self.name_index.setdefault(token, []).append(position)
+        self.fuzzy_index = RegencyNameIndex(regencies, self.normalize_name)
+
+    def refresh_index(self):
+        """
+        Crawl all regencies again and rewrite the local cache file. A failed crawl raises and
+        leaves the cache file untouched.
+        """
+        print("Refreshing regency index from the API...")
+        regencies = self.crawl_regencies()
+        fetched_at = time.time()
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            json.dump({'fetched_at': fetched_at, 'regencies': regencies}, f, ensure_ascii=False)
+        self._build_index(regencies, fetched_at)
+
+    def load_index(self):
+        """
+        Load the regency index from the cache file, crawling only when it is missing or stale.
+        """
+        if self.loaded_at is not None and time.time() - self.loaded_at < self.max_age:
+            return
+        cached = None
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file, encoding="utf-8") as f:
+                cached = json.load(f)
+            if time.time() - cached['fetched_at'] < self.max_age:
+                self._build_index(cached['regencies'], cached['fetched_at'])
+                return
+        try:
+            self.refresh_index()
+        except HTTPClientError as e:
+            if cached is None:
+                raise
+            print(f"[WARN] Refresh failed ({e}); keeping the previous regency index.")
+            self._build_index(cached['regencies'], cached['fetched_at'])
+            # Try the crawl again after retry_interval rather than on every search
+            self.loaded_at = time.time() - self.max_age + self.retry_interval
 
     def search_city_by_name(self, city_name):
         """
         Search for a city by name across all provinces.
-        Performs a case-insensitive match.
+        Performs a case-insensitive match against the local regency index.
         """
+        self.load_index()
+        query = self.normalize_name(city_name)
+        # normalize_name drops separators at either end; keep them as a space so 'a ' still only
+        # matches a word ending in 'a', as the plain substring test did
+        leading = " " if re.match(r"\W", city_name) else ""
+        trailing = " " if re.search(r"\W$", city_name) else ""
+        pattern = leading + query + trailing
+
+        # A name containing the query contains each query word inside one of its tokens, so
+        # candidates are names having, for every query word, some token that contains it
+        # (scanning the distinct tokens, not every name). A query with no words matches nothing.
+        candidates = None
+        for word in query.split():
+            positions = set()
+            for token, token_positions in self.name_index.items():
+                if word in token:
+                    positions.update(token_positions)
+            candidates = positions if candidates is None else candidates & positions
+        candidates = sorted(candidates or ())
+
         matches = []
-        for prov_id in range(11, 95):  # ID range from Aceh (11) to Papua (94)
-            cities = self.get_cities_by_province_id(str(prov_id))
-            for city in cities:
-                if city_name.lower() in city['name'].lower():
-                    matches.append({
-                        'province_id': prov_id,
-                        'city_id': city['id'],
-                        'city_name': city['name']
-                    })
+        for position in candidates:
+            if pattern in self.normalized_names[position]:
+                city = self.regencies[position]
+                matches.append({
+                    'province_id': int(city['province_id']),
+                    'city_id': city['city_id'],
+                    'city_name': city['city_name']
+                })
         print(f"\nFound {len(matches)} city(ies) matching '{city_name}':")
         for match in matches:
             print(f"- {match['city_name']} (Province ID: {match['province_id']}, City ID: {match['city_id']})")
         return matches
 
+    def suggest_cities(self, query, limit=10):
+        """
+        Ranked fuzzy/prefix matches for autocomplete; tolerates typos and abbreviations.
+        Each result carries a similarity 'score'.
+        """
+        self.load_index()
+        return self.fuzzy_index.search(query, limit)
+
 
 if __name__ == "__main__":
     api = IndonesianCityAPI()
@@ -54,3 +240,8 @@ if __name__ == "__main__":
     # Search for "Bandung"
     print("\nSearching for cities with name containing 'Bandung'...")
     bandung_matches = api.search_city_by_name("Bandung")
+
+    # Fuzzy / autocomplete lookup: tolerates typos and "Kab." for "Kabupaten"
+    print("\nSuggestions for 'Kab. Bandnug':")
+    for suggestion in api.suggest_cities("Kab. Bandnug", limit=5):
+        print(f"- {suggestion['city_name']} (score {suggestion['score']})")
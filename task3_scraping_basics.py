@@ -1,8 +1,15 @@
-from bs4 import BeautifulSoup
+import codecs
 import csv
+from html.parser import HTMLParser
+import numpy as np
+from html_backends import parse_document
+from page_archive import fetch_page
+from parse_pool import ParsePool
 
 
 class WeatherData:
+    __slots__ = ("city", "temperature", "condition", "humidity")  # no per-instance __dict__
+
     def __init__(self, city, temperature, condition, humidity):
         self.city = city
         self.temperature = float(temperature)  # Celsius, e.g., 30.5
@@ -13,17 +20,125 @@ class WeatherData:
         return [self.city, self.temperature, self.condition, self.humidity]
 
 
+class WeatherTable:
+    """
+    Column-oriented weather records: NumPy arrays for the measurements and categorical
+    codes (index into `cities` / `conditions`) for the repeated strings.
+    """
+
+    def __init__(self, cities, city_codes, temperatures, conditions, condition_codes, humidities):
+        self.cities = cities
+        self.city_codes = city_codes
+        self.temperatures = temperatures
+        self.conditions = conditions
+        self.condition_codes = condition_codes
+        self.humidities = humidities
+
+    @classmethod
+    def from_records(cls, records):
+        records = list(records)
+        cities, city_codes = np.unique([r.city for r in records], return_inverse=True)
+        conditions, condition_codes = np.unique([r.condition for r in records], return_inverse=True)
+        return cls(
+            cities, city_codes.astype(np.int32),
+            np.fromiter((r.temperature for r in records), dtype=np.float64, count=len(records)),
+            conditions, condition_codes.astype(np.int16),
+            np.fromiter((r.humidity for r in records), dtype=np.int16, count=len(records)),
+        )
+
+    def __len__(self):
+        return len(self.temperatures)
+
+    def record(self, i):
+        return WeatherData(self.cities[self.city_codes[i]], self.temperatures[i],
+                           self.conditions[self.condition_codes[i]], f"{self.humidities[i]}%")
+
+
+class WeatherTableStreamParser(HTMLParser):
+    """
+    Incremental parser for table.weather-table: feed() it text as it arrives and collect the
+    cell texts of each <tr> from `rows` as soon as the row closes. No tree is built.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.table_depth = 0  # >0 while inside the weather table (counts nested tables)
+        self.row = None
+        self.cell = None
+        self.text = []  # data seen since the last tag; feed() may split one text node
+        self.rows = []  # completed rows waiting to be consumed
+
+    def _flush_text(self):
+        if self.text:
+            if self.cell is not None:
+                self.cell.append("".join(self.text))
+            self.text = []
+
+    def _close_cell(self):
+        self._flush_text()
+        if self.cell is not None:
+            # Same result as BeautifulSoup's get_text(strip=True)
+            self.row.append("".join(piece.strip() for piece in self.cell if piece.strip()))
+            self.cell = None
+
+    def _close_row(self):
+        if self.row is not None:
+            self._close_cell()
+            self.rows.append(self.row)
+            self.row = None
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag == "table":
+            if self.table_depth:
+                self.table_depth += 1
+            elif "weather-table" in (dict(attrs).get("class") or "").split():
+                self.table_depth = 1
+        elif not self.table_depth:
+            return
+        elif tag == "tr":
+            self._close_row()  # tolerate an omitted </tr>
+            self.row = []
+        elif tag in ("td", "th") and self.row is not None:
+            self._close_cell()  # tolerate an omitted </td>
+            self.cell = [] if tag == "td" else None
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if not self.table_depth:
+            return
+        if tag in ("td", "th") and self.row is not None:
+            self._close_cell()
+        elif tag == "tr":
+            self._close_row()
+        elif tag == "table":
+            self.table_depth -= 1
+            if not self.table_depth:
+                self._close_row()
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.text.append(data)
+
+
 class WeatherScraper:
-    def __init__(self, html_content):
+    def __init__(self, html_content, parser="html.parser"):
         self.html_content = html_content
+        self.parser = parser  # see html_backends.BACKENDS; "lxml" is the fast C backend
         self.weather_data = []
 
+    @classmethod
+    def from_url(cls, url, parser="html.parser", archive=None):
+        """Fetch a weather page (recorded to / replayed from `archive` when given) and wrap it."""
+        response = fetch_page(url, archive)
+        return cls(response.text if response is not None else "", parser=parser)
+
     def parse_html(self):
-        soup = BeautifulSoup(self.html_content, "html.parser")
+        soup = parse_document(self.html_content, self.parser)
         rows = soup.select("table.weather-table tr")[1:]  # skip header row
 
         for row in rows:
-            cells = row.find_all("td")
+            cells = row.select("td")
             if len(cells) >= 4:
                 city = cells[0].get_text(strip=True)
                 temp = cells[1].get_text(strip=True).replace("°C", "")
@@ -31,6 +146,40 @@ class WeatherScraper:
                 humidity = cells[3].get_text(strip=True)
                 self.weather_data.append(WeatherData(city, temp, condition, humidity))
 
+    def iter_parse_stream(self, chunks, encoding="utf-8"):
+        """
+        Streaming alternative to parse_html: takes an iterable of byte (or str) chunks, e.g.
+        response.iter_content(), and yields a WeatherData as each table row closes. Peak memory
+        stays at one chunk plus one row; rows are not kept in self.weather_data.
+        """
+        parser = WeatherTableStreamParser()
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        seen_header = False
+        for chunk in chunks:
+            parser.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+            for cells in parser.rows:
+                if not seen_header:
+                    seen_header = True  # skip header row, as parse_html does
+                    continue
+                if len(cells) >= 4:
+                    yield WeatherData(cells[0], cells[1].replace("°C", ""), cells[2], cells[3])
+            parser.rows.clear()
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+        for cells in parser.rows:
+            if seen_header and len(cells) >= 4:
+                yield WeatherData(cells[0], cells[1].replace("°C", ""), cells[2], cells[3])
+            seen_header = True
+
+    def parse_pages(self, pages, workers=None):
+        """Parse several weather pages (HTML strings) on a process pool, appending rows in page order."""
+        with ParsePool("weather", workers, self.parser) as pool:
+            for rows, _ in pool.imap((html, None) for html in pages):
+                self.weather_data.extend(rows)
+
+    def to_table(self):
+        return WeatherTable.from_records(self.weather_data)
+
     def save_to_csv(self, filename="weather_data.csv"):
         with open(filename, mode="w", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
@@ -41,23 +190,52 @@ class WeatherScraper:
 
 class WeatherAnalyzer:
     def __init__(self, weather_data):
+        # Accepts a list of WeatherData or a WeatherTable; statistics run on the columnar form
+        if not isinstance(weather_data, WeatherTable):
+            weather_data = WeatherTable.from_records(weather_data)
         self.weather_data = weather_data
 
     def get_summary(self):
-        if not self.weather_data:
+        if not len(self.weather_data):
             print("No data to analyze.")
             return
 
-        temps = [entry.temperature for entry in self.weather_data]
-        highest = max(self.weather_data, key=lambda x: x.temperature)
-        lowest = min(self.weather_data, key=lambda x: x.temperature)
-        avg = sum(temps) / len(temps)
+        table = self.weather_data
+        temps = table.temperatures
+        highest = table.record(int(temps.argmax()))
+        lowest = table.record(int(temps.argmin()))
+        avg = temps.mean()
 
         print("\n--- Weather Summary ---")
         print(f"Hottest city: {highest.city} ({highest.temperature}°C)")
         print(f"Coldest city: {lowest.city} ({lowest.temperature}°C)")
         print(f"Average temperature: {avg:.2f}°C")
 
+    def get_city_summary(self):
+        """
+        Per-city count, mean/min/max temperature and mean humidity, computed with grouped
+        NumPy reductions over the city codes.
+        """
+        table = self.weather_data
+        groups = len(table.cities)
+        counts = np.bincount(table.city_codes, minlength=groups)
+        temp_sums = np.bincount(table.city_codes, weights=table.temperatures, minlength=groups)
+        humidity_sums = np.bincount(table.city_codes, weights=table.humidities, minlength=groups)
+        temp_max = np.full(groups, -np.inf)
+        temp_min = np.full(groups, np.inf)
+        np.maximum.at(temp_max, table.city_codes, table.temperatures)
+        np.minimum.at(temp_min, table.city_codes, table.temperatures)
+        return {
+            str(city): {
+                "count": int(counts[i]),
+                "mean_temperature": float(temp_sums[i] / counts[i]),
+                "min_temperature": float(temp_min[i]),
+                "max_temperature": float(temp_max[i]),
+                "mean_humidity": float(humidity_sums[i] / counts[i]),
+            }
+            for i, city in enumerate(table.cities)
+        }
+
 
 # --- Sample Execution Code ---
 if __name__ == "__main__":
@@ -81,5 +259,6 @@ if __name__ == "__main__":
     scraper.save_to_csv()
 
     # Analyze
-    analyzer = WeatherAnalyzer(scraper.weather_data)
+    analyzer = WeatherAnalyzer(scraper.to_table())
     analyzer.get_summary()
+    print(analyzer.get_city_summary())
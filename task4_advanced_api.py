@@ -1,7 +1,46 @@
-import requests
-import time
 import json
 import csv
+import pandas as pd
+from dimension_join import DimensionTable, LazyJoinView, join
+from retry_engine import RetryError, get_default_engine
+from wilayah_crawler import WilayahCrawler
+
+
+class CsvStreamSink:
+    """
+    Writes rows to CSV one at a time; the header comes from the first row's keys.
+    Like NdjsonStreamSink, the file is truncated on open, so a run with no rows leaves it empty.
+    """
+
+    def __init__(self, filename="integrated_data.csv"):
+        self.filename = filename
+        self.file = open(filename, mode="w", newline="", encoding="utf-8")
+        self.writer = None
+
+    def write(self, row):
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=list(row.keys()))
+            self.writer.writeheader()
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class NdjsonStreamSink:
+    """
+    Writes one JSON object per line, so output can be appended and read back incrementally.
+    """
+
+    def __init__(self, filename="integrated_data.ndjson"):
+        self.filename = filename
+        self.file = open(filename, "w", encoding="utf-8")
+
+    def write(self, row):
+        self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
 
 
 class IndonesianDataCollector:
@@ -10,48 +49,52 @@ class IndonesianDataCollector:
         self.headers = {
             "User-Agent": "IndoDataCollector/1.0"
         }
+        self.retry_engine = get_default_engine()
+        self.failed_parents = []  # crawler failures from the last iter_regional_data run
 
     def safe_api_call(self, url, max_retries=3):
         """
-        Perform an HTTP GET request with exponential backoff retry strategy.
-        """
-        delay = 1
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, headers=self.headers, timeout=10)
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"[WARN] Attempt {attempt + 1} failed with status {response.status_code}")
-            except requests.RequestException as e:
-                print(f"[ERROR] Request failed: {e}")
-            time.sleep(delay)
-            delay *= 2  # exponential backoff
-        print("[FAIL] Max retries reached. Skipping request.")
-        return []
-
-    def get_regional_data(self):
+        Perform an HTTP GET request through the shared retry engine (jittered backoff,
+        Retry-After, circuit breaker). Returns None on failure, so a failed request is not
+        mistaken for an empty result.
         """
-        Get all provinces and their respective cities.
+        try:
+            response = self.retry_engine.get(url, headers=self.headers, timeout=10, max_attempts=max_retries)
+        except RetryError as e:
+            print(f"[FAIL] {e}. Skipping request.")
+            return None
+        if response.status_code != 200:
+            print(f"[FAIL] {url} returned status {response.status_code}. Skipping request.")
+            return None
+        return response.json()
+
+    def iter_regional_data(self, level="regencies"):
+        """
+        Stream provinces and their cities (or districts/villages) as they are crawled.
+        Parents whose child lists could not be fetched are reported at the end and kept in
+        self.failed_parents, so missing rows are not mistaken for empty regions.
         """
         print("[INFO] Fetching provinces...")
+        self.failed_parents = []
         provinces = self.safe_api_call(f"{self.base_url}/provinces.json")
-        regional_data = []
-
-        for prov in provinces[:5]:  # limit to 5 provinces for demo
-            prov_id = prov["id"]
-            prov_name = prov["name"]
-            print(f"[INFO] Fetching cities for {prov_name}...")
-            cities = self.safe_api_call(f"{self.base_url}/regencies/{prov_id}.json")
-            for city in cities:
-                regional_data.append({
-                    "province_id": prov_id,
-                    "province_name": prov_name,
-                    "city_id": city["id"],
-                    "city_name": city["name"]
-                })
-
-        return regional_data
+        if provinces is None:
+            print("[ERROR] Could not fetch provinces; no regional data collected.")
+            self.failed_parents = [{"level": "provinces", "parent": None}]
+            return
+        print(f"[INFO] Crawling {level} for {len(provinces)} provinces...")
+        crawler = WilayahCrawler(self.base_url, headers=self.headers, retry_engine=self.retry_engine)
+        yield from crawler.iter_rows(level, provinces=provinces)
+        self.failed_parents = crawler.failures
+        for failure in crawler.failures:
+            parent = ", ".join(f"{key}={value}" for key, value in (failure["parent"] or {}).items()
+                               if key.endswith("_id"))
+            print(f"[ERROR] Could not fetch {failure['level']} for {parent}; its rows are missing.")
+
+    def get_regional_data(self, level="regencies"):
+        """
+        Get all provinces and their respective cities.
+        """
+        return list(self.iter_regional_data(level))
 
     def get_economic_indicators(self):
         """
@@ -68,26 +111,60 @@ class IndonesianDataCollector:
         }
         return economic_data
 
-    def integrate_all_data(self):
+    def get_economic_dimension(self):
         """
-        Combine regional and economic data into a unified report.
+        Economic indicators as a province-keyed dimension table.
+        """
+        return DimensionTable.from_mapping("economic", self.get_economic_indicators(), key="province_id")
+
+    def iter_integrated_data(self, level="regencies"):
+        """
+        Stream regional rows joined with economic data, one row at a time as the crawl progresses.
         """
         print("[INFO] Integrating all data...")
-        regional_data = self.get_regional_data()
-        economic_data = self.get_economic_indicators()
+        economic = self.get_economic_dimension()
 
-        final_data = []
-        for row in regional_data:
-            econ = economic_data.get(row["province_id"], {})
-            integrated = {
+        for row in self.iter_regional_data(level):
+            econ = economic.lookup(row["province_id"])
+            yield {
                 **row,
                 "GDP": econ.get("GDP", None),
                 "inflation": econ.get("inflation", None),
                 "exchange_rate": econ.get("exchange_rate", None)
             }
-            final_data.append(integrated)
 
-        return final_data
+    def integrate_all_data(self, level="regencies"):
+        """
+        Combine regional and economic data into a unified report.
+        """
+        return list(self.iter_integrated_data(level))
+
+    def integrate_dataframe(self, level="regencies", normalized=False):
+        """
+        Batch version of the integration using a vectorized hash join. With normalized=True the
+        regional facts are kept as-is and a LazyJoinView joins GDP/inflation only when queried.
+        """
+        facts = pd.DataFrame(self.iter_regional_data(level))
+        economic = self.get_economic_dimension()
+        if normalized:
+            return LazyJoinView(facts, [(economic, "province_id")])
+        return join(facts, economic, on="province_id")
+
+    def export_stream(self, rows, sinks):
+        """
+        Write rows to every sink in a single pass with constant memory; returns the row count.
+        """
+        count = 0
+        try:
+            for row in rows:
+                for sink in sinks:
+                    sink.write(row)
+                count += 1
+        finally:
+            for sink in sinks:
+                sink.close()
+        print(f"[INFO] Exported {count} rows to {', '.join(sink.filename for sink in sinks)}")
+        return count
 
     def export_to_csv(self, data, filename="integrated_data.csv"):
         print(f"[INFO] Exporting to {filename}...")
@@ -108,7 +185,9 @@ class IndonesianDataCollector:
 
 if __name__ == "__main__":
     collector = IndonesianDataCollector()
-    integrated_data = collector.integrate_all_data()
 
-    collector.export_to_csv(integrated_data)
-    collector.export_to_json(integrated_data)
+    # Crawl -> join -> CSV + NDJSON in one streaming pass; use level="villages" for the full crawl
+    collector.export_stream(
+        collector.iter_integrated_data(level="regencies"),
+        [CsvStreamSink("integrated_data.csv"), NdjsonStreamSink("integrated_data.ndjson")]
+    )
@@ -1,108 +1,227 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import matplotlib.pyplot as plt
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from aggregate_store import AggregateStore
+from extraction_spec import ExtractionSpec, Field, parse_count, parse_decimal, parse_rupiah
+from html_backends import parse_document
+from http_client import HTTPClientError, get_default_client
+from page_archive import fetch_page
+from parse_pool import ParsePool
+from product_store import ProductStore, product_key
 
 
 class IndonesianEcommerceScraper:
-    def __init__(self):
-        self.products = []
+    def __init__(self, parser="html.parser", archive=None, store=None):
+        self.parser = parser  # see html_backends.BACKENDS; "lxml" is the fast C backend
+        self.archive = archive  # page_archive.PageArchive; fetched pages are recorded or replayed
+        self.store = store  # product_store.ProductStore; parsed pages are upserted into it
+        self.products = []  # one entry per product_key; a repeated listing replaces the earlier copy
+        self.product_index = {}  # product_key -> position in self.products
+        # Running price statistics, updated as products are parsed; analyze_products reports from these
+        self.aggregates = AggregateStore("price", ("category", "seller_location"), counted=("rating",))
+        # Adjust selectors to the actual site
+        self.product_spec = ExtractionSpec(".product-card", [
+            Field("name", ".product-title"),
+            Field("price", ".product-price", parse_rupiah),
+            Field("rating", ".product-rating", parse_decimal),
+            Field("reviews_count", ".product-reviews", parse_count),
+            Field("seller_location", ".product-seller-location"),
+        ])
         self.base_url = "https://example.com/{category}?page={page}"  # Replace with real e-commerce source
 
     def fetch_html(self, url):
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
+            response = fetch_page(url, self.archive)
+            if response is not None and response.status_code == 200:
                 return response.text
-        except requests.RequestException as e:
+        except HTTPClientError as e:
             print(f"[ERROR] {e}")
         return None
 
+    @property
+    def replaying(self):
+        return self.archive is not None and self.archive.replay
+
+    def add_products(self, products):
+        """Merge parsed products into self.products (deduplicated by product_key) and the store."""
+        for product in products:
+            key = product_key(product["name"], product["seller_location"])
+            if key in self.product_index:
+                position = self.product_index[key]
+                self.aggregates.replace(self.products[position], product)
+                self.products[position] = product
+            else:
+                self.product_index[key] = len(self.products)
+                self.products.append(product)
+                self.aggregates.add(product)
+        if self.store is not None and products:
+            self.store.upsert_many(products)
+
     def parse_products(self, html, category):
-        soup = BeautifulSoup(html, "html.parser")
-        product_cards = soup.select(".product-card")  # Adjust selector to actual site
-
-        for card in product_cards:
-            try:
-                name = card.select_one(".product-title").text.strip()
-                price = int(card.select_one(".product-price").text.replace("Rp", "").replace(".", "").strip())
-                rating = float(card.select_one(".product-rating").text.strip())
-                reviews = int(card.select_one(".product-reviews").text.strip().split()[0])
-                seller = card.select_one(".product-seller-location").text.strip()
-                
-                self.products.append({
-                    "name": name,
-                    "price": price,
-                    "rating": rating,
-                    "reviews_count": reviews,
-                    "category": category,
-                    "seller_location": seller
-                })
-            except Exception as e:
-                print(f"[WARN] Skipping a product due to parsing error: {e}")
-
-    def scrape_products(self, category, max_pages=3):
-        print(f"[INFO] Scraping category: {category}")
+        """Parse one listing page, add its products, and return them (duplicates included)."""
+        soup = parse_document(html, self.parser)
+        skipped = self.product_spec.skipped
+        products = [{
+            "name": card["name"],
+            "price": card["price"],
+            "rating": card["rating"],
+            "reviews_count": card["reviews_count"],
+            "category": category,
+            "seller_location": card["seller_location"]
+        } for card in self.product_spec.extract_all(soup)]
+        if self.product_spec.skipped > skipped:
+            print(f"[WARN] Skipped {self.product_spec.skipped - skipped} malformed products in '{category}'; "
+                  f"errors so far: {self.product_spec.error_report()}")
+        self.add_products(products)
+        return products
+
+    def iter_pages(self, category, max_pages=3):
+        """Fetch the category's listing pages, yielding (html, category) as each one arrives."""
         for page in range(1, max_pages + 1):
             url = self.base_url.format(category=category, page=page)
             html = self.fetch_html(url)
             if html:
-                self.parse_products(html, category)
-            time.sleep(random.uniform(1.5, 3.0))  # Polite scraping delay
-
-    def analyze_products(self):
-        if not self.products:
+                yield html, category
+            if not self.replaying:
+                time.sleep(random.uniform(1.5, 3.0))  # Polite scraping delay
+
+    def parse_pages(self, pages, workers=None):
+        """
+        Parse (html, category) pages on a process pool; products are added in page order and each
+        worker's per-field error counters are merged into self.product_spec.
+        """
+        with ParsePool("products", workers, self.parser) as pool:
+            for products, counters in pool.imap(pages):
+                self.product_spec.merge(counters)
+                self.add_products(products)
+
+    def scrape_products(self, category, max_pages=3, workers=0):
+        """
+        workers=0 parses each page inline after fetching it; otherwise pages are handed to a
+        pool of `workers` processes (None = all cores) so fetching never waits on parsing.
+        """
+        print(f"[INFO] Scraping category: {category}")
+        pages = self.iter_pages(category, max_pages)
+        if workers == 0:
+            for html, page_category in pages:
+                self.parse_products(html, page_category)
+        else:
+            self.parse_pages(pages, workers)
+
+    def crawl_categories(self, categories, max_pages=50, pages_ahead=2, max_workers=8,
+                         max_per_host=4, min_interval=2.0):
+        """
+        Crawl several categories concurrently and yield each page's products as soon as it is
+        parsed (products are also added to self.products and the store).
+
+        The politeness delay is applied per host instead of sleeping after every page: the shared
+        client's policy for the site's host is set to request starts at least `min_interval` apart
+        and at most `max_per_host` in flight (see HTTPClient.set_host_policy). Each category
+        keeps up to `pages_ahead` pages in flight and stops at the first page that fails, is
+        empty, or is shorter than its first page (the last page), rather than at `max_pages`.
+        """
+        if not self.replaying:
+            get_default_client().set_host_policy(self.base_url, max_per_host=max_per_host,
+                                                  min_interval=min_interval)
+        next_page = {category: 1 for category in categories}
+        last_page = {category: max_pages for category in categories}
+        page_size = {}
+        pending = {}
+
+        def fetch(category, page):
+            return self.fetch_html(self.base_url.format(category=category, page=page))
+
+        def submit(pool, category):
+            if next_page[category] <= last_page[category]:
+                pending[pool.submit(fetch, category, next_page[category])] = (category, next_page[category])
+                next_page[category] += 1
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for category in categories:
+                print(f"[INFO] Scraping category: {category}")
+                for _ in range(pages_ahead):
+                    submit(pool, category)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    category, page = pending.pop(future)
+                    if page > last_page[category]:
+                        continue  # fetched speculatively past the category's last page
+                    html = future.result()
+                    products = self.parse_products(html, category) if html else []
+                    if not products:
+                        last_page[category] = min(last_page[category], page - 1)
+                    else:
+                        if page == 1:
+                            page_size[category] = len(products)
+                        elif len(products) < page_size.get(category, 0):
+                            last_page[category] = min(last_page[category], page)
+                        yield products
+                    submit(pool, category)
+
+    def analyze_products(self, report_file="analysis_report.txt"):
+        """Print and save the price report. Built from the running aggregates, not the product rows."""
+        if not self.aggregates.records:
             print("[WARN] No product data to analyze.")
             return
 
-        df = pd.DataFrame(self.products)
-
-        # Save to CSV
-        df.to_csv("indonesia_products.csv", index=False)
-        print("[INFO] Saved products to 'indonesia_products.csv'")
-
-        # Group by category: price statistics
-        category_stats = df.groupby("category")["price"].describe()
+        # Group by category: price statistics. Quantiles are sketch estimates (within 1%); so are
+        # min/max once a re-scraped listing replaced a group's cheapest or dearest product
+        category_stats = self.aggregates.describe("category")
+        estimated = "quantiles" if self.aggregates.exact_extremes("category") else "quantiles, min and max"
+        stats_note = f"({estimated} are estimates within 1%)"
         print("\n--- Price Statistics by Category ---\n", category_stats)
+        print(stats_note)
 
         # Top sellers
-        top_sellers = df["seller_location"].value_counts().head(5)
+        top_sellers = self.aggregates.group_sizes("seller_location", 5)
         print("\n--- Top 5 Seller Locations ---\n", top_sellers)
 
         # Rating distribution
-        rating_dist = df["rating"].value_counts().sort_index()
+        rating_dist = self.aggregates.value_counts("rating")
         print("\n--- Rating Distribution ---\n", rating_dist)
 
         # Save analysis report
-        with open("analysis_report.txt", "w") as f:
+        with open(report_file, "w") as f:
             f.write("--- Price Statistics by Category ---\n")
             f.write(str(category_stats))
+            f.write("\n" + stats_note)
             f.write("\n\n--- Top 5 Seller Locations ---\n")
             f.write(str(top_sellers))
             f.write("\n\n--- Rating Distribution ---\n")
             f.write(str(rating_dist))
-        print("[INFO] Analysis report saved as 'analysis_report.txt'")
+        print(f"[INFO] Analysis report saved as '{report_file}'")
+
+    def save_to_csv(self, filename="indonesia_products.csv"):
+        pd.DataFrame(self.products).to_csv(filename, index=False)
+        print(f"[INFO] Saved products to '{filename}'")
 
-        # Visualization
+    def plot_price_comparison(self, filename="price_comparison.png"):
         plt.figure(figsize=(8, 5))
-        df.groupby("category")["price"].mean().sort_values().plot(kind="bar", color="skyblue")
+        self.aggregates.group_means("category").sort_values().plot(kind="bar", color="skyblue")
         plt.ylabel("Average Price (Rp)")
         plt.title("Average Product Price by Category")
         plt.xticks(rotation=45)
         plt.tight_layout()
-        plt.savefig("price_comparison.png")
-        print("[INFO] Price comparison chart saved as 'price_comparison.png'")
-
+        plt.savefig(filename)
+        plt.close()
+        print(f"[INFO] Price comparison chart saved as '{filename}'")
 
 if __name__ == "__main__":
-    scraper = IndonesianEcommerceScraper()
+    store = ProductStore()
+    scraper = IndonesianEcommerceScraper(store=store)
 
     # Simulated categories; replace with actual categories or URLs
     categories = ["elektronik", "fashion", "makanan", "rumah-tangga"]
 
-    for cat in categories:
-        scraper.scrape_products(cat, max_pages=3)
+    for products in scraper.crawl_categories(categories):
+        print(f"[INFO] {len(products)} products from '{products[0]['category']}'")
 
+    scraper.save_to_csv()
     scraper.analyze_products()
+    scraper.plot_price_comparison()
+
+    changes = store.price_changes(days=30)
+    print(f"\n--- Price Changes over the Last 30 Days ({len(changes)} products) ---\n", changes.head(10))
@@ -1,30 +1,47 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import time
 from collections import Counter
+from html_backends import parse_document
+from http_client import HTTPClientError
+from keyword_matcher import KeywordMatcher
+from page_archive import fetch_page
+from parse_pool import ParsePool
 
 
 class IndonesianNewsScraper:
-    def __init__(self):
+    def __init__(self, parser="html.parser", archive=None):
+        self.parser = parser  # see html_backends.BACKENDS; "lxml" is the fast C backend
+        self.archive = archive  # page_archive.PageArchive; fetched pages are recorded or replayed
         self.base_url = "https://example-news.com/{category}/page/{page}"  # placeholder
         self.categories = ["politik", "ekonomi", "teknologi", "olahraga", "hiburan"]
         self.news_data = []
         self.positive_keywords = {"maju", "sukses", "positif", "menang", "stabil"}
         self.negative_keywords = {"gagal", "turun", "korupsi", "negatif", "kalah"}
+        self.sentiment_matcher = None
+        self.rebuild_sentiment_matcher()
+
+    def rebuild_sentiment_matcher(self):
+        """Compile the keyword sets (+1 / -1 polarity) into self.sentiment_matcher; call again after changing them."""
+        lexicon = {word: 1 for word in self.positive_keywords}
+        lexicon.update({word: -1 for word in self.negative_keywords})
+        self.sentiment_matcher = KeywordMatcher(lexicon)
 
     def fetch_html(self, url):
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
+            response = fetch_page(url, self.archive)
+            if response is not None and response.status_code == 200:
                 return response.text
-        except Exception as e:
+        except HTTPClientError as e:
             print(f"[ERROR] Failed to fetch {url}: {e}")
         return None
 
+    @property
+    def replaying(self):
+        return self.archive is not None and self.archive.replay
+
     def parse_articles(self, html, category):
-        soup = BeautifulSoup(html, "html.parser")
+        soup = parse_document(html, self.parser)
         articles = soup.select(".news-card")  # Update this selector
 
         for card in articles:
@@ -36,6 +53,7 @@ class IndonesianNewsScraper:
 
                 cleaned_summary = self.clean_news_text(summary)
                 sentiment_tags = self.identify_sentiment_keywords(cleaned_summary)
+                sentiment_score = self.sentiment_matcher.score(cleaned_summary)
 
                 self.news_data.append({
                     "title": title,
@@ -43,19 +61,37 @@ class IndonesianNewsScraper:
                     "category": category,
                     "source": source,
                     "date": date,
-                    "sentiment_keywords": sentiment_tags
+                    "sentiment_keywords": sentiment_tags,
+                    "sentiment_score": sentiment_score
                 })
             except Exception as e:
                 print(f"[WARN] Failed to parse article: {e}")
 
-    def scrape_news_category(self, category, max_pages=5):
-        print(f"[INFO] Scraping category: {category}")
+    def iter_pages(self, category, max_pages=5):
+        """Fetch the category's pages, yielding (html, category) as each one arrives."""
         for page in range(1, max_pages + 1):
             url = self.base_url.format(category=category, page=page)
             html = self.fetch_html(url)
             if html:
-                self.parse_articles(html, category)
-            time.sleep(1.5)  # polite delay
+                yield html, category
+            if not self.replaying:
+                time.sleep(1.5)  # polite delay
+
+    def parse_pages(self, pages, workers=None):
+        """Parse (html, category) pages on a process pool; articles are appended in page order."""
+        with ParsePool("articles", workers, self.parser) as pool:
+            for articles, _ in pool.imap(pages):
+                self.news_data.extend(articles)
+
+    def scrape_news_category(self, category, max_pages=5, workers=0):
+        """workers=0 parses inline; otherwise parsing runs on a process pool (None = all cores)."""
+        print(f"[INFO] Scraping category: {category}")
+        pages = self.iter_pages(category, max_pages)
+        if workers == 0:
+            for html, page_category in pages:
+                self.parse_articles(html, page_category)
+        else:
+            self.parse_pages(pages, workers)
 
     def clean_news_text(self, text):
         text = re.sub(r"\s+", " ", text)  # remove excessive whitespace
@@ -64,11 +100,12 @@ class IndonesianNewsScraper:
         return text.lower().strip()
 
     def identify_sentiment_keywords(self, text):
-        found = set()
-        for word in self.positive_keywords.union(self.negative_keywords):
-            if word in text:
-                found.add(word)
-        return list(found)
+        # Whole words only, in order of first appearance: "turun" no longer matches "diturunkan"
+        return self.sentiment_matcher.found(text)
+
+    def sentiment_keyword_counts(self, text):
+        return self.sentiment_matcher.counts(text)
 
     def export_to_json(self, filename="news_dataset.json"):
-        with open(filename, "w", encoding="utf-8") as
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(self.news_data, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from retry_engine import RetryError, get_default_engine
+
+
+class WilayahCrawler:
+    """
+    Concurrent crawler for the emsifa wilayah API: provinces -> regencies -> districts -> villages.
+    Rows are streamed to the caller as soon as each response arrives (not in ID order).
+    A parent whose children could not be fetched is recorded in `failures` rather than being
+    treated as having no children.
+    """
+
+    LEVELS = ("provinces", "regencies", "districts", "villages")
+
+    def __init__(self, base_url="https://www.emsifa.com/api-wilayah-indonesia/api", headers=None,
+                 max_workers=16, max_per_host=None, min_interval=None, timeout=10, retry_engine=None):
+        self.base_url = base_url
+        self.headers = headers or {"User-Agent": "IndoDataCollector/1.0"}
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # Requests go through the shared retry engine and its client (pooled keep-alive
+        # connections); politeness limits, when given, are set on the client for the API host
+        self.retry_engine = retry_engine or get_default_engine()
+        if max_per_host is not None or min_interval is not None:
+            self.retry_engine.client.set_host_policy(base_url, max_per_host=max_per_host,
+                                                     min_interval=min_interval)
+        self.failures = []  # {"level": ..., "parent": row} for every child list that could not be fetched
+
+    def fetch(self, path):
+        """
+        Fetch one JSON list from the API through the retry engine. Returns None (after reporting)
+        once retries are exhausted, the host's circuit is open, or the response is not a 200.
+        """
+        url = f"{self.base_url}/{path}"
+        try:
+            response = self.retry_engine.get(url, headers=self.headers, timeout=self.timeout)
+        except RetryError as e:
+            print(f"[ERROR] {e}")
+            return None
+        if response.status_code != 200:
+            print(f"[WARN] {url} returned status {response.status_code}")
+            return None
+        return response.json()
+
+    def get_provinces(self):
+        return self.fetch("provinces.json")
+
+    @staticmethod
+    def _children(level, row, items):
+        # Extend the parent row with the child level's id/name columns
+        prefix = {"regencies": "city", "districts": "district", "villages": "village"}[level]
+        for item in items:
+            yield {**row, f"{prefix}_id": item["id"], f"{prefix}_name": item["name"]}
+
+    def iter_rows(self, level="regencies", provinces=None):
+        """
+        Yield one flat row per entity at `level`, e.g. for "districts":
+        province_id, province_name, city_id, city_name, district_id, district_name.
+        """
+        depth = self.LEVELS.index(level)
+        if provinces is None:
+            provinces = self.get_provinces()
+            if provinces is None:
+                self.failures.append({"level": "provinces", "parent": None})
+                return
+        province_rows = [{"province_id": p["id"], "province_name": p["name"]} for p in provinces]
+        if depth == 0:
+            yield from province_rows
+            return
+
+        id_key = {"regencies": "province_id", "districts": "city_id", "villages": "district_id"}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def submit(child_level, row):
+                future = executor.submit(self.fetch, f"{child_level}/{row[id_key[child_level]]}.json")
+                pending[future] = (child_level, row)
+
+            pending = {}
+            for row in province_rows:
+                submit("regencies", row)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    child_level, row = pending.pop(future)
+                    items = future.result()
+                    if items is None:
+                        self.failures.append({"level": child_level, "parent": row})
+                        continue
+                    children = self._children(child_level, row, items)
+                    if self.LEVELS.index(child_level) == depth:
+                        yield from children
+                    else:
+                        next_level = self.LEVELS[self.LEVELS.index(child_level) + 1]
+                        for child in children:
+                            submit(next_level, child)